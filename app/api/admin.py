@@ -1,5 +1,10 @@
+import asyncio
+
+import orjson
 from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi.responses import Response, StreamingResponse
+from typing import Iterable, Iterator, List
+from pydantic import BaseModel
 from app.models import ToolConfig, AgentConfig, GraphConfig
 from app.services.yaml_service import YAMLService
 from app.services.tool_service import ToolService
@@ -7,42 +12,74 @@ from app.services.tool_service import ToolService
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
+async def _ensure_tools_exist(tool_names: List[str]) -> None:
+    known = await asyncio.to_thread(YAMLService.known_tool_names)
+    missing = [tool_name for tool_name in tool_names if tool_name not in known]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tools not found: {', '.join(missing)}"
+        )
+
+
+def _refresh_tool_schema(tool_name: str) -> None:
+    saved = YAMLService.load_tool(tool_name)
+    if saved:
+        ToolService.persist_tool_schema(saved)
+
+
+def _config_response(config: BaseModel) -> Response:
+    """Serialize a config loaded from disk without FastAPI re-validating it against the response model."""
+    return Response(content=config.model_dump_json(), media_type="application/json")
+
+
+def _stream_json_array(items: Iterable[str]) -> Iterator[bytes]:
+    """Encode items as a JSON array incrementally, one element per chunk."""
+    yield b"["
+    for index, item in enumerate(items):
+        yield (b"," if index else b"") + orjson.dumps(item)
+    yield b"]"
+
+
 @router.get("/tools", response_model=List[str])
-async def list_tools():
-    """List all available tools."""
-    return YAMLService.list_tools()
+async def list_tools(stream: bool = False):
+    """List all available tools; with ``stream=true`` the names are streamed as they are found."""
+    if stream:
+        return StreamingResponse(_stream_json_array(YAMLService.iter_tools()), media_type="application/json")
+    return await asyncio.to_thread(YAMLService.list_tools)
 
 
 @router.get("/tools/{tool_name}", response_model=ToolConfig)
 async def get_tool(tool_name: str):
     """Get a specific tool configuration."""
-    tool = YAMLService.load_tool(tool_name)
+    tool = await asyncio.to_thread(YAMLService.load_tool, tool_name)
     if not tool:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Tool '{tool_name}' not found"
         )
-    return tool
+    return _config_response(tool)
 
 
 @router.post("/tools", response_model=ToolConfig, status_code=status.HTTP_201_CREATED)
 async def create_tool(tool: ToolConfig):
     """Create a new tool."""
-    existing = YAMLService.load_tool(tool.name)
+    existing = await asyncio.to_thread(YAMLService.load_tool, tool.name)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Tool '{tool.name}' already exists"
         )
     
-    YAMLService.save_tool(tool)
+    await asyncio.to_thread(YAMLService.save_tool, tool)
+    await asyncio.to_thread(_refresh_tool_schema, tool.name)
     return tool
 
 
 @router.put("/tools/{tool_name}", response_model=ToolConfig)
 async def update_tool(tool_name: str, tool: ToolConfig):
     """Update an existing tool."""
-    existing = YAMLService.load_tool(tool_name)
+    existing = await asyncio.to_thread(YAMLService.load_tool, tool_name)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,16 +87,17 @@ async def update_tool(tool_name: str, tool: ToolConfig):
         )
     
     if tool.name != tool_name:
-        YAMLService.delete_tool(tool_name)
+        await asyncio.to_thread(YAMLService.delete_tool, tool_name)
     
-    YAMLService.save_tool(tool)
+    await asyncio.to_thread(YAMLService.save_tool, tool)
+    await asyncio.to_thread(_refresh_tool_schema, tool.name)
     return tool
 
 
 @router.delete("/tools/{tool_name}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_tool(tool_name: str):
     """Delete a tool."""
-    if not YAMLService.delete_tool(tool_name):
+    if not await asyncio.to_thread(YAMLService.delete_tool, tool_name):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Tool '{tool_name}' not found"
@@ -69,7 +107,7 @@ async def delete_tool(tool_name: str):
 @router.get("/tools/{tool_name}/schema")
 async def get_tool_schema(tool_name: str):
     """Get OpenAI function calling schema for a tool."""
-    tool = YAMLService.load_tool(tool_name)
+    tool = await asyncio.to_thread(YAMLService.load_tool, tool_name)
     if not tool:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -80,72 +118,64 @@ async def get_tool_schema(tool_name: str):
 
 
 @router.get("/agents", response_model=List[str])
-async def list_agents():
-    """List all available agents."""
-    return YAMLService.list_agents()
+async def list_agents(stream: bool = False):
+    """List all available agents; with ``stream=true`` the names are streamed as they are found."""
+    if stream:
+        return StreamingResponse(_stream_json_array(YAMLService.iter_agents()), media_type="application/json")
+    return await asyncio.to_thread(YAMLService.list_agents)
 
 
 @router.get("/agents/{agent_name}", response_model=AgentConfig)
 async def get_agent(agent_name: str):
     """Get a specific agent configuration."""
-    agent = YAMLService.load_agent(agent_name)
+    agent = await asyncio.to_thread(YAMLService.load_agent, agent_name)
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Agent '{agent_name}' not found"
         )
-    return agent
+    return _config_response(agent)
 
 
 @router.post("/agents", response_model=AgentConfig, status_code=status.HTTP_201_CREATED)
 async def create_agent(agent: AgentConfig):
     """Create a new agent."""
-    existing = YAMLService.load_agent(agent.name)
+    existing = await asyncio.to_thread(YAMLService.load_agent, agent.name)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Agent '{agent.name}' already exists"
         )
     
-    for tool_name in agent.tools:
-        if not YAMLService.load_tool(tool_name):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Tool '{tool_name}' not found"
-            )
+    await _ensure_tools_exist(agent.tools)
     
-    YAMLService.save_agent(agent)
+    await asyncio.to_thread(YAMLService.save_agent, agent)
     return agent
 
 
 @router.put("/agents/{agent_name}", response_model=AgentConfig)
 async def update_agent(agent_name: str, agent: AgentConfig):
     """Update an existing agent."""
-    existing = YAMLService.load_agent(agent_name)
+    existing = await asyncio.to_thread(YAMLService.load_agent, agent_name)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Agent '{agent_name}' not found"
         )
     
-    for tool_name in agent.tools:
-        if not YAMLService.load_tool(tool_name):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Tool '{tool_name}' not found"
-            )
+    await _ensure_tools_exist(agent.tools)
     
     if agent.name != agent_name:
-        YAMLService.delete_agent(agent_name)
+        await asyncio.to_thread(YAMLService.delete_agent, agent_name)
     
-    YAMLService.save_agent(agent)
+    await asyncio.to_thread(YAMLService.save_agent, agent)
     return agent
 
 
 @router.delete("/agents/{agent_name}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_agent(agent_name: str):
     """Delete an agent."""
-    if not YAMLService.delete_agent(agent_name):
+    if not await asyncio.to_thread(YAMLService.delete_agent, agent_name):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Agent '{agent_name}' not found"
@@ -155,39 +185,39 @@ async def delete_agent(agent_name: str):
 @router.get("/graphs", response_model=List[str])
 async def list_graphs():
     """List all available graphs."""
-    return YAMLService.list_graphs()
+    return await asyncio.to_thread(YAMLService.list_graphs)
 
 
 @router.get("/graphs/{graph_id}", response_model=GraphConfig)
 async def get_graph(graph_id: str):
     """Get a specific graph configuration."""
-    graph = YAMLService.load_graph(graph_id)
+    graph = await asyncio.to_thread(YAMLService.load_graph, graph_id)
     if not graph:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Graph '{graph_id}' not found"
         )
-    return graph
+    return _config_response(graph)
 
 
 @router.post("/graphs", response_model=GraphConfig, status_code=status.HTTP_201_CREATED)
 async def create_graph(graph: GraphConfig):
     """Create a new graph."""
-    existing = YAMLService.load_graph(graph.id)
+    existing = await asyncio.to_thread(YAMLService.load_graph, graph.id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Graph '{graph.id}' already exists"
         )
 
-    YAMLService.save_graph(graph)
+    await asyncio.to_thread(YAMLService.save_graph, graph)
     return graph
 
 
 @router.put("/graphs/{graph_id}", response_model=GraphConfig)
 async def update_graph(graph_id: str, graph: GraphConfig):
     """Update an existing graph."""
-    existing = YAMLService.load_graph(graph_id)
+    existing = await asyncio.to_thread(YAMLService.load_graph, graph_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -195,16 +225,16 @@ async def update_graph(graph_id: str, graph: GraphConfig):
         )
 
     if graph.id != graph_id:
-        YAMLService.delete_graph(graph_id)
+        await asyncio.to_thread(YAMLService.delete_graph, graph_id)
 
-    YAMLService.save_graph(graph)
+    await asyncio.to_thread(YAMLService.save_graph, graph)
     return graph
 
 
 @router.delete("/graphs/{graph_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_graph(graph_id: str):
     """Delete a graph."""
-    if not YAMLService.delete_graph(graph_id):
+    if not await asyncio.to_thread(YAMLService.delete_graph, graph_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Graph '{graph_id}' not found"
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Any, AsyncIterator, Dict, List
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from app.models import (
     ToolExecutionRequest,
     ToolExecutionResponse,
     AgentExecutionRequest,
+    AgentBatchExecutionRequest,
     AgentExecutionResponse,
     GraphExecutionRequest,
     GraphExecutionResponse
@@ -13,6 +18,31 @@ from app.services.graph_service import GraphService
 
 router = APIRouter(prefix="/execute", tags=["Execution"])
 
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _encode(event: Dict[str, Any]) -> bytes:
+    return orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+async def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Format execution events as server-sent events."""
+    async for event in events:
+        yield b"data: " + _encode(event) + b"\n\n"
+
+
+async def _ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Format execution events as newline-delimited JSON."""
+    async for event in events:
+        yield _encode(event) + b"\n"
+
+
+def _event_stream(raw_request: Request, events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Stream events as NDJSON when the client asks for it, otherwise as server-sent events."""
+    if "application/x-ndjson" in raw_request.headers.get("accept", ""):
+        return StreamingResponse(_ndjson(events), media_type="application/x-ndjson", headers=STREAM_HEADERS)
+    return StreamingResponse(_sse(events), media_type="text/event-stream", headers=STREAM_HEADERS)
+
 
 @router.post("/tool", response_model=ToolExecutionResponse)
 async def execute_tool(request: ToolExecutionRequest):
@@ -51,9 +81,51 @@ async def execute_graph(request: GraphExecutionRequest):
     return result
 
 
+@router.post("/graph/stream")
+async def execute_graph_stream(request: GraphExecutionRequest, raw_request: Request):
+    """Execute a graph, streaming steps as server-sent events or NDJSON."""
+    events = GraphService.execute_graph_stream(
+        request.graph_id,
+        request.input,
+        request.context,
+        request.llm_override,
+    )
+    return _event_stream(raw_request, events)
+
+
+@router.post("/agent/stream")
+async def execute_agent_stream(request: AgentExecutionRequest, raw_request: Request):
+    """Execute an agent, streaming steps as server-sent events or NDJSON."""
+    events = AgentService.execute_agent_stream(
+        request.agent_name,
+        request.input,
+        request.context,
+        request.llm_override,
+        request.framework_override,
+    )
+    return _event_stream(raw_request, events)
+
+
+@router.post("/agent/batch", response_model=List[AgentExecutionResponse])
+async def execute_agent_batch(request: AgentBatchExecutionRequest):
+    """Execute an agent over a list of inputs; per-input failures are reported in each response."""
+    return await AgentService.execute_agent_batch(
+        request.agent_name,
+        request.inputs,
+        request.context,
+        request.llm_override,
+        request.framework_override,
+        request.concurrency,
+        request.use_batch_api,
+    )
+
+
 @router.post("/agent", response_model=AgentExecutionResponse)
-async def execute_agent(request: AgentExecutionRequest):
+async def execute_agent(request: AgentExecutionRequest, raw_request: Request):
     """Execute an agent with given input."""
+    if request.stream:
+        return await execute_agent_stream(request, raw_request)
+
     result = await AgentService.execute_agent(
         request.agent_name,
         request.input,
@@ -6,13 +6,16 @@ import re
 from dotenv import dotenv_values
 
 
+_ENV_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+
+
 def _expand_env_value(value: str, env_map: Dict[str, str]) -> str:
-    pattern = r"\$\{([^}]+)\}"
-    result = value
-    for match in re.findall(pattern, value):
-        resolved = os.getenv(match) or env_map.get(match) or ""
-        result = result.replace(f"${{{match}}}", resolved)
-    return result
+    if "${" not in value:
+        return value
+    return _ENV_VAR_RE.sub(
+        lambda match: os.getenv(match.group(1)) or env_map.get(match.group(1)) or "",
+        value,
+    )
 
 
 def _load_env_with_expansion(path: str = ".env") -> None:
@@ -21,10 +24,15 @@ def _load_env_with_expansion(path: str = ".env") -> None:
 
     for _ in range(3):
         updated = False
+        env_map = {**resolved, **os.environ}
         for key, value in resolved.items():
-            expanded = _expand_env_value(value, {**resolved, **os.environ})
+            if "${" not in value:
+                continue
+            expanded = _expand_env_value(value, env_map)
             if expanded != value:
                 resolved[key] = expanded
+                if key not in os.environ:
+                    env_map[key] = expanded
                 updated = True
         if not updated:
             break
@@ -55,12 +63,21 @@ class Settings(BaseSettings):
     auto_app_reload: bool = Field(default=False)
     debug_trace: bool = Field(default=False)
     ssl_verify: bool = Field(default=True)
+    http_max_connections: int = Field(default=200)
+    http_max_keepalive: int = Field(default=100)
+    openai_batch_max_wait: float = Field(default=900.0)
     
     langfuse_enabled: bool = Field(default=False)
     langfuse_public_key: Optional[str] = Field(default=None)
     langfuse_secret_key: Optional[str] = Field(default=None)
     langfuse_host: Optional[str] = Field(default=None)
     
+    llm_cache_enabled: bool = Field(default=False)
+    llm_cache_max_entries: int = Field(default=1024)
+    llm_cache_ttl: int = Field(default=3600)
+    llm_cache_memcached_host: Optional[str] = Field(default=None)
+    llm_cache_memcached_port: int = Field(default=11211)
+    
     data_dir: str = Field(default="./data")
     agents_dir: str = Field(default="./data/agents")
     tools_dir: str = Field(default="./data/tools")
@@ -1,7 +1,15 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import admin, execution
 from app.config import settings
+from app.services.yaml_service import YAMLService
+from app.services.tool_service import ToolService
+from app.services.agent_frameworks.google_adk_adapter import load_adk, clear_runner_cache
+from app.services.agent_frameworks.langgraph_adapter import clear_app_cache
+from app.services.agent_frameworks.openai_direct_adapter import close_client_cache
+from app.services.graph_service import GraphService, clear_graph_cache
+from app.services.llm_service import LLMService
 import logging
 
 logging.basicConfig(
@@ -10,13 +18,41 @@ logging.basicConfig(
     force=True
 )
 
+# The log format does not use thread/process fields, so skip collecting them per record.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 logger = logging.getLogger(__name__)
 logger.info("ADK logging configured at level=%s", settings.log_level.upper())
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm per-worker caches before the first request is served and release them on shutdown."""
+    YAMLService.warm_cache()
+    ToolService.warm_schemas()
+    GraphService.warm_graphs()
+    try:
+        load_adk()
+    except ImportError:
+        logger.info("google-adk not installed; google_adk framework disabled")
+    ToolService.get_http_client()
+    logger.info("ADK worker warm-up complete")
+    yield
+    await ToolService.close_http_client()
+    clear_runner_cache()
+    clear_app_cache()
+    await close_client_cache()
+    clear_graph_cache()
+    await LLMService.close_http_clients()
+
+
 app = FastAPI(
     title="Agent Development Kit (ADK)",
     description="Simple base agent development framework with YAML configs and REST APIs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
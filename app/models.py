@@ -53,6 +53,11 @@ class ToolConfig(BaseModel):
     
     python_code: Optional[str] = Field(default=None, description="Python code for PYTHON type")
     
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="Tools whose calls in the same LLM turn must finish first (dependency strategy)",
+    )
+    
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -63,7 +68,11 @@ class AgentConfig(BaseModel):
     system_prompt: str = Field(description="System prompt for the agent")
     tools: List[str] = Field(default_factory=list, description="List of tool names available to agent")
     max_iterations: int = Field(default=10, ge=1, description="Maximum reasoning iterations")
-    framework: Literal["langgraph", "google_adk", "openai_direct"] = Field(default="langgraph")
+    tool_execution_strategy: Literal["sequential", "parallel", "dependency"] = Field(
+        default="parallel",
+        description="How tool calls from one LLM turn are scheduled",
+    )
+    framework: Literal["langgraph", "google_adk", "openai_direct", "openai_batch"] = Field(default="langgraph")
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -160,7 +169,17 @@ class AgentExecutionRequest(BaseModel):
     context: Dict[str, Any] = Field(default_factory=dict)
     stream: bool = Field(default=False)
     llm_override: Optional[LLMOverride] = None
-    framework_override: Optional[Literal["langgraph", "google_adk", "openai_direct"]] = None
+    framework_override: Optional[Literal["langgraph", "google_adk", "openai_direct", "openai_batch"]] = None
+
+
+class AgentBatchExecutionRequest(BaseModel):
+    agent_name: str
+    inputs: List[str]
+    context: Dict[str, Any] = Field(default_factory=dict)
+    concurrency: int = Field(default=10, ge=1, description="Maximum inputs executed at once")
+    use_batch_api: bool = Field(default=False, description="Submit via the provider Batch API when supported")
+    llm_override: Optional[LLMOverride] = None
+    framework_override: Optional[Literal["langgraph", "google_adk", "openai_direct", "openai_batch"]] = None
 
 
 class AgentExecutionResponse(BaseModel):
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, AsyncIterator
 
 from app.models import AgentConfig, LLMOverride
 
@@ -18,3 +18,21 @@ class AgentFramework(ABC):
         llm_override: Optional[LLMOverride] = None,
     ) -> Tuple[str, List[Dict[str, Any]]]:
         """Execute the agent and return output plus step metadata."""
+
+    async def execute_stream(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        context: Dict[str, Any],
+        llm_override: Optional[LLMOverride] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``step`` events as they are produced, then a final ``result`` event.
+
+        Frameworks that stream model output also yield ``token`` events. Those
+        that cannot emit steps incrementally fall back to running ``execute``
+        and replaying its steps.
+        """
+        output, steps = await self.execute(agent_config, user_input, context, llm_override)
+        for step in steps:
+            yield {"type": "step", "data": step}
+        yield {"type": "result", "output": output}
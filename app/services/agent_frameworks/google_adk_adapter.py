@@ -2,15 +2,109 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Dict, Any, List, Tuple, Optional
+from contextvars import ContextVar
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, Any, List, Tuple, Optional, AsyncIterator
 
-from app.models import AgentConfig, LLMOverride
+from app.models import AgentConfig, LLMConfig, LLMOverride
 from app.config import settings
 from app.services.llm_service import LLMService
 from app.services.agent_frameworks.base import AgentFramework
-from app.services.tool_service import ToolService
+from app.services.tool_service import ToolService, _IdentityKey
 from app.services.yaml_service import YAMLService
 
+_ADK: Optional[SimpleNamespace] = None
+
+
+def load_adk() -> SimpleNamespace:
+    """Import google-adk once and cache the classes used to build agents and runners."""
+    global _ADK
+    if _ADK is None:
+        try:
+            from google.adk.agents import LlmAgent, SequentialAgent
+            from google.adk.runners import Runner
+            from google.adk.sessions import InMemorySessionService
+            from google.genai import types
+        except ImportError as exc:
+            raise ImportError(
+                "google-adk is required for google_adk framework. Install with 'pip install google-adk'."
+            ) from exc
+        _ADK = SimpleNamespace(
+            LlmAgent=LlmAgent,
+            SequentialAgent=SequentialAgent,
+            Runner=Runner,
+            InMemorySessionService=InMemorySessionService,
+            types=types,
+        )
+    return _ADK
+
+
+def set_google_api_key(api_key: Optional[str]) -> None:
+    """Expose the API key to the google-genai client, writing the environment only when it changes.
+
+    ADK builds its Gemini client from ``GOOGLE_API_KEY`` and offers no per-agent key hook.
+    """
+    if api_key and os.environ.get("GOOGLE_API_KEY") != api_key:
+        os.environ["GOOGLE_API_KEY"] = api_key
+
+
+# LLM settings for the request currently driving a shared runner; read by tool functions.
+_tool_llm_context: ContextVar[Tuple[Optional[LLMOverride], Optional[LLMConfig]]] = ContextVar(
+    "adk_tool_llm_context", default=(None, None)
+)
+
+
+@lru_cache(maxsize=512)
+def _make_adk_tool(tool_name: str, description: str):
+    """Build the ADK function for a tool once; per-request LLM settings come from the context."""
+
+    async def tool_func(tool_name_arg=tool_name, **kwargs):
+        llm_override, llm_config = _tool_llm_context.get()
+        result = await ToolService.execute_tool(tool_name_arg, kwargs, llm_override, llm_config)
+        if result.success:
+            return result.result
+        return {"error": result.error}
+
+    tool_func.__name__ = tool_name
+    tool_func.__doc__ = description
+    return tool_func
+
+
+@lru_cache(maxsize=64)
+def _get_runner(
+    agent_name: str,
+    description: str,
+    instruction: str,
+    tool_keys: Tuple[_IdentityKey, ...],
+    model: str,
+    app_name: str,
+) -> Tuple[Any, Any]:
+    """Build and cache an ADK runner and its session service for one agent shape.
+
+    Tools are keyed by their shared YAMLService instances, so a created or edited tool YAML
+    yields a new runner.
+    """
+    adk = load_adk()
+
+    tools = [_make_adk_tool(key.value.name, key.value.description) for key in tool_keys]
+
+    adk_agent = adk.LlmAgent(
+        name=agent_name,
+        model=model,
+        instruction=instruction,
+        description=description,
+        tools=tools,
+    )
+    session_service = adk.InMemorySessionService()
+    runner = adk.Runner(agent=adk_agent, app_name=app_name, session_service=session_service)
+    return runner, session_service
+
+
+def clear_runner_cache() -> None:
+    """Drop cached runners and their in-memory session services."""
+    _get_runner.cache_clear()
+
 
 class GoogleADKAdapter(AgentFramework):
     name = "google_adk"
@@ -24,80 +118,67 @@ class GoogleADKAdapter(AgentFramework):
         context: Dict[str, Any],
         llm_override: Optional[LLMOverride] = None,
     ) -> Tuple[str, List[Dict[str, Any]]]:
-        try:
-            from google.adk.agents import LlmAgent
-            from google.adk.runners import Runner
-            from google.adk.sessions import InMemorySessionService
-            from google.genai import types
-        except ImportError as exc:
-            raise ImportError(
-                "google-adk is required for google_adk framework. Install with 'pip install google-adk'."
-            ) from exc
+        steps: List[Dict[str, Any]] = []
+        final_output = ""
+        async for event in self.execute_stream(agent_config, user_input, context, llm_override):
+            if event["type"] == "step":
+                steps.append(event["data"])
+            else:
+                final_output = event["output"]
+        return final_output, steps
+
+    async def execute_stream(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        context: Dict[str, Any],
+        llm_override: Optional[LLMOverride] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        adk = load_adk()
 
         llm_config = LLMService.resolve_llm_config(agent_config.llm_config, llm_override)
-        google_api_key = llm_config.api_key or settings.llm_api_key
-        if google_api_key:
-            os.environ["GOOGLE_API_KEY"] = google_api_key
-
-        tools = []
-        for tool_name in agent_config.tools:
-            tool_config = YAMLService.load_tool(tool_name)
-            if not tool_config:
-                continue
-
-            async def tool_func(tool_name_arg=tool_name, **kwargs):
-                result = await ToolService.execute_tool(tool_name_arg, kwargs, llm_override, llm_config)
-                if result.success:
-                    return result.result
-                return {"error": result.error}
-
-            tool_func.__name__ = tool_name
-            tool_func.__doc__ = tool_config.description
-            tools.append(tool_func)
-
-        adk_agent = LlmAgent(
-            name=agent_config.name,
-            model=llm_config.model,
-            instruction=agent_config.system_prompt,
-            description=agent_config.description,
-            tools=tools,
-        )
+        set_google_api_key(llm_config.api_key or settings.llm_api_key)
 
         app_name = agent_config.metadata.get("app_name", agent_config.name)
         user_id = agent_config.metadata.get("user_id", "local-user")
-        session_id = agent_config.metadata.get("session_id", "local-session")
 
-        session_service = InMemorySessionService()
-        await session_service.create_session(
-            app_name=app_name,
-            user_id=user_id,
-            session_id=session_id,
+        runner, session_service = _get_runner(
+            agent_config.name,
+            agent_config.description,
+            agent_config.system_prompt,
+            tuple(_IdentityKey(tool_config) for tool_config in YAMLService.load_tools(agent_config.tools)),
+            llm_config.model,
+            app_name,
         )
+        # Runners are shared, so each run gets its own session to keep histories isolated.
+        session = await session_service.create_session(app_name=app_name, user_id=user_id)
+        token = _tool_llm_context.set((llm_override, llm_config))
+        try:
+            content = adk.types.Content(role="user", parts=[adk.types.Part(text=user_input)])
+            events = runner.run_async(user_id=user_id, session_id=session.id, new_message=content)
 
-        runner = Runner(agent=adk_agent, app_name=app_name, session_service=session_service)
-        content = types.Content(role="user", parts=[types.Part(text=user_input)])
-        events = runner.run_async(user_id=user_id, session_id=session_id, new_message=content)
-
-        steps: List[Dict[str, Any]] = []
-        final_output = ""
+            final_output = ""
 
-        async for event in events:
-            step: Dict[str, Any] = {"type": "adk_event"}
-            event_type = getattr(event, "type", None)
-            if event_type is not None:
-                step["event_type"] = event_type
+            async for event in events:
+                step: Dict[str, Any] = {"type": "adk_event"}
+                event_type = getattr(event, "type", None)
+                if event_type is not None:
+                    step["event_type"] = event_type
 
-            content_text = None
-            if getattr(event, "content", None) is not None and getattr(event.content, "parts", None):
-                part = event.content.parts[0]
-                content_text = getattr(part, "text", None)
+                content_text = None
+                if getattr(event, "content", None) is not None and getattr(event.content, "parts", None):
+                    part = event.content.parts[0]
+                    content_text = getattr(part, "text", None)
 
-            if content_text:
-                step["content"] = content_text
+                if content_text:
+                    step["content"] = content_text
 
-            steps.append(step)
+                yield {"type": "step", "data": step}
 
-            if hasattr(event, "is_final_response") and event.is_final_response():
-                final_output = content_text or ""
+                if hasattr(event, "is_final_response") and event.is_final_response():
+                    final_output = content_text or ""
+        finally:
+            _tool_llm_context.reset(token)
+            await session_service.delete_session(app_name=app_name, user_id=user_id, session_id=session.id)
 
-        return final_output, steps
+        yield {"type": "result", "output": final_output}
@@ -1,226 +1,368 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import operator
-from typing import Any, Dict, List, TypedDict, Annotated, Tuple, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    TypedDict,
+    Annotated,
+    Tuple,
+    Optional,
+)
 
 from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage, BaseMessage
-from langchain_core.tools import tool
+from langchain_core.messages import (
+    HumanMessage,
+    AIMessage,
+    AIMessageChunk,
+    SystemMessage,
+    ToolMessage,
+    BaseMessage,
+    convert_to_openai_messages,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.runnables import RunnableConfig
 
 from app.config import settings
 from app.models import AgentConfig, LLMOverride
 from app.services.agent_frameworks.base import AgentFramework
+from app.services.llm_cache import get_llm_cache
 from app.services.llm_service import LLMService
-from app.services.tool_service import ToolService
+from app.services.tool_service import ToolService, _IdentityKey
 from app.services.yaml_service import YAMLService
 
 
+@dataclass(slots=True)
+class Step:
+    """One reasoning turn or tool execution, converted to the public step dict on output."""
+
+    type: str
+    content: Any = None
+    tool_name: Optional[str] = None
+    arguments: Optional[Dict[str, Any]] = None
+    result: Any = None
+    success: Optional[bool] = None
+    tool_calls: Optional[List[Dict[str, Any]]] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"type": self.type}
+        for field_name in _STEP_FIELDS[self.type]:
+            data[field_name] = getattr(self, field_name)
+        return data
+
+
+_STEP_FIELDS = {
+    "reasoning": ("content", "tool_calls"),
+    "tool_execution": ("tool_name", "arguments", "result", "success"),
+}
+
+
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     iteration: int
     last_response: Any
-    context: Dict[str, Any]
+    # Tool calls of last_response, normalized to a list once by agent_node.
+    tool_calls: List[Dict[str, Any]]
+
+
+class _AgentNodes(NamedTuple):
+    agent: Callable[[AgentState, RunnableConfig], Awaitable[Dict[str, Any]]]
+    tools: Callable[[AgentState, RunnableConfig], Awaitable[Dict[str, Any]]]
+    should_continue: Callable[[AgentState], str]
+
+
+@lru_cache(maxsize=128)
+def _build_nodes(
+    agent_key: _IdentityKey,
+    llm_override_json: Optional[str],
+    tool_keys: Tuple[_IdentityKey, ...],
+    loop: asyncio.AbstractEventLoop,
+) -> _AgentNodes:
+    """Build the node implementations once per agent, LLM override, tool set and event loop.
+
+    Agent and tool configs are keyed by their shared YAMLService instances, which change
+    whenever the YAML does. ``loop`` keeps the captured LLM client on the loop its async
+    pool belongs to. The per-call ``steps`` sink reaches the nodes through
+    ``config["configurable"]``.
+    """
+    logger = LangGraphAdapter.logger
+    agent_config: AgentConfig = agent_key.value
+    llm_override = LLMOverride.model_validate_json(llm_override_json) if llm_override_json else None
+
+    logger.debug("Building LangGraph agent with %d tools", len(tool_keys))
+    llm_config = LLMService.resolve_llm_config(agent_config.llm_config, llm_override)
+    llm = LLMService.get_llm(llm_config)
+
+    tool_schemas = [ToolService.get_tool_schema(key.value) for key in tool_keys]
+    llm_with_tools = llm.bind_tools(tool_schemas) if tool_schemas else llm
+    logger.debug("LangGraph agent configured with %d bound tools", len(tool_schemas))
+
+    cache = get_llm_cache()
+
+    async def agent_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        steps = config["configurable"]["steps"]
+        messages = state["messages"]
+        is_first_call = state.get("last_response") is None
+        iteration = 0 if is_first_call else state.get("iteration", 0) + 1
+        logger.debug("agent_node: messages in state: %d, iteration: %s", len(messages), iteration)
+
+        if settings.debug_trace and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "LangGraph LLM request: %s",
+                json.dumps(
+                    {
+                        "provider": llm_config.provider,
+                        "model": llm_config.model,
+                        "messages": [m.model_dump() for m in messages],
+                        "tool_names": [schema["function"]["name"] for schema in tool_schemas],
+                    },
+                    default=str,
+                ),
+            )
 
+        cache_key = (
+            cache.cache_key(
+                llm_config.model,
+                convert_to_openai_messages(messages),
+                tool_schemas,
+                llm_config.temperature,
+                base_url=llm_config.base_url,
+                max_tokens=llm_config.max_tokens,
+                additional_params=llm_config.additional_params,
+            )
+            if cache
+            else None
+        )
+        cached = await cache.get(cache_key) if cache_key else None
+
+        if cached is not None:
+            response = messages_from_dict([cached])[0]
+        else:
+            response = await llm_with_tools.ainvoke(messages)
+            if cache_key:
+                await cache.set(cache_key, message_to_dict(response))
+        tool_calls = list(getattr(response, "tool_calls", None) or [])
+
+        if settings.debug_trace and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "LangGraph LLM response: %s",
+                json.dumps(
+                    {
+                        "content": response.content,
+                        "tool_calls": tool_calls,
+                        "additional": getattr(response, "additional_kwargs", {}),
+                    },
+                    default=str,
+                ),
+            )
 
-class LangGraphAdapter(AgentFramework):
-    name = "langgraph"
+        steps.append(Step("reasoning", content=response.content, tool_calls=tool_calls))
 
-    logger = logging.getLogger(__name__)
+        return {
+            "messages": [response],
+            "last_response": response,
+            "tool_calls": tool_calls,
+            "iteration": iteration,
+        }
 
-    async def execute(
-        self,
-        agent_config: AgentConfig,
-        user_input: str,
-        context: Dict[str, Any],
-        llm_override: Optional[LLMOverride] = None,
-    ) -> Tuple[str, List[Dict[str, Any]]]:
-        self.logger.debug("Building LangGraph agent with %d tools", len(agent_config.tools))
-        llm_config = LLMService.resolve_llm_config(agent_config.llm_config, llm_override)
-        llm = LLMService.get_llm(llm_config)
-
-        tools = []
-        for tool_name in agent_config.tools:
-            tool_config = YAMLService.load_tool(tool_name)
-            if not tool_config:
-                continue
+    def should_continue(state: AgentState) -> str:
+        iteration = state.get("iteration", 0)
+        tool_calls = state.get("tool_calls")
 
-            def create_tool_func(tn: str, description: str):
-                async def tool_func(**kwargs):
-                    result = await ToolService.execute_tool(tn, kwargs, llm_override, llm_config)
-                    if result.success:
-                        return result.result
-                    return f"Error: {result.error}"
+        logger.debug("should_continue: iteration=%s, max=%s", iteration, agent_config.max_iterations)
 
-                tool_func.__name__ = tn
-                tool_func.__doc__ = description
-                return tool_func
+        if iteration >= agent_config.max_iterations:
+            logger.debug(
+                "should_continue: max iterations reached (%s/%s), ending",
+                iteration,
+                agent_config.max_iterations,
+            )
+            return END
 
-            tool_func = create_tool_func(tool_name, tool_config.description)
-            decorated_tool = tool(tool_func)
-            tools.append(decorated_tool)
+        if tool_calls:
+            logger.debug("should_continue: %d tool calls found, continuing to tools", len(tool_calls))
+            return "tools"
 
-        llm_with_tools = llm.bind_tools(tools) if tools else llm
-        self.logger.debug("LangGraph agent configured with %d bound tools", len(tools))
+        logger.debug("should_continue: no tool calls, ending")
+        return END
 
-        steps: List[Dict[str, Any]] = []
+    async def tool_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        steps = config["configurable"]["steps"]
+        messages: List[BaseMessage] = []
+        tool_calls = state.get("tool_calls")
 
-        def agent_node(state: AgentState) -> AgentState:
-            messages_in_state = state.get("messages", [])
-            self.logger.debug(
-                "agent_node: ENTRY - messages in state: %d, iteration: %s",
-                len(messages_in_state),
-                state.get("iteration", "NOT SET"),
+        if tool_calls:
+            results = await ToolService.execute_tool_calls(
+                [(tool_call["name"], tool_call.get("args", {})) for tool_call in tool_calls],
+                agent_config.tool_execution_strategy,
+                llm_override,
+                llm_config,
             )
 
-            is_first_call = "messages" not in state or len(messages_in_state) == 0
-
-            if is_first_call:
-                messages = [
-                    SystemMessage(content=agent_config.system_prompt),
-                    HumanMessage(content=user_input),
-                ]
-                state["iteration"] = 0
-                self.logger.debug("agent_node: first iteration, iteration=0")
-            else:
-                messages = list(messages_in_state)
-                state["iteration"] = state.get("iteration", 0) + 1
-                self.logger.debug("agent_node: incrementing iteration to %s", state["iteration"])
-
-            if settings.debug_trace:
-                self.logger.debug(
-                    "LangGraph LLM request: %s",
-                    json.dumps(
-                        {
-                            "provider": llm_config.provider,
-                            "model": llm_config.model,
-                            "messages": [m.model_dump() for m in messages],
-                            "tool_names": [t.name for t in tools],
-                        },
-                        default=str,
-                    ),
+            for tool_call, result in zip(tool_calls, results):
+                tool_name = tool_call["name"]
+                tool_args = tool_call.get("args", {})
+
+                steps.append(
+                    Step(
+                        "tool_execution",
+                        tool_name=tool_name,
+                        arguments=tool_args,
+                        result=result.result if result.success else result.error,
+                        success=result.success,
+                    )
                 )
 
-            response = llm_with_tools.invoke(messages)
-            messages.append(response)
-
-            if settings.debug_trace:
-                self.logger.debug(
-                    "LangGraph LLM response: %s",
-                    json.dumps(
-                        {
-                            "content": response.content,
-                            "tool_calls": getattr(response, "tool_calls", []),
-                            "additional": getattr(response, "additional_kwargs", {}),
-                        },
-                        default=str,
-                    ),
+                messages.append(
+                    ToolMessage(
+                        content=str(result.result if result.success else result.error),
+                        tool_call_id=tool_call.get("id", ""),
+                    )
                 )
 
-            steps.append(
-                {
-                    "type": "reasoning",
-                    "content": response.content,
-                    "tool_calls": getattr(response, "tool_calls", []),
-                }
-            )
+        return {"messages": messages}
 
-            state["messages"] = messages
-            state["last_response"] = response
+    return _AgentNodes(agent=agent_node, tools=tool_node, should_continue=should_continue)
 
-            self.logger.debug(
-                "agent_node: EXIT - messages in state: %d, iteration: %s",
-                len(state["messages"]),
-                state["iteration"],
-            )
 
-            return state
+async def _agent_step(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    return await config["configurable"]["nodes"].agent(state, config)
 
-        def should_continue(state: AgentState) -> str:
-            last_response = state.get("last_response")
-            iteration = state.get("iteration", 0)
 
-            self.logger.debug("should_continue: iteration=%s, max=%s", iteration, agent_config.max_iterations)
+async def _tool_step(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+    return await config["configurable"]["nodes"].tools(state, config)
 
-            if not last_response:
-                self.logger.debug("should_continue: no last_response, ending")
-                return END
 
-            if iteration >= agent_config.max_iterations:
-                self.logger.debug(
-                    "should_continue: max iterations reached (%s/%s), ending",
-                    iteration,
-                    agent_config.max_iterations,
-                )
-                return END
+def _route(state: AgentState, config: RunnableConfig) -> str:
+    return config["configurable"]["nodes"].should_continue(state)
 
-            if hasattr(last_response, "tool_calls") and last_response.tool_calls:
-                self.logger.debug(
-                    "should_continue: %d tool calls found, continuing to tools",
-                    len(last_response.tool_calls),
-                )
-                return "tools"
 
-            self.logger.debug("should_continue: no tool calls, ending")
-            return END
+def _compile_agent_graph():
+    """Compile the agent -> tools -> agent topology shared by every LangGraph agent.
 
-        async def tool_node(state: AgentState) -> AgentState:
-            last_response = state.get("last_response")
-            messages = state.get("messages", [])
-
-            if hasattr(last_response, "tool_calls") and last_response.tool_calls:
-                for tool_call in last_response.tool_calls:
-                    tool_name = tool_call["name"]
-                    tool_args = tool_call.get("args", {})
-
-                    result = await ToolService.execute_tool(tool_name, tool_args, llm_override, llm_config)
-
-                    steps.append(
-                        {
-                            "type": "tool_execution",
-                            "tool_name": tool_name,
-                            "arguments": tool_args,
-                            "result": result.result if result.success else result.error,
-                            "success": result.success,
-                        }
-                    )
+    Node bodies are looked up per run from ``config["configurable"]["nodes"]``.
+    """
+    workflow = StateGraph(AgentState)
 
-                    messages.append(
-                        ToolMessage(
-                            content=str(result.result if result.success else result.error),
-                            tool_call_id=tool_call.get("id", ""),
-                        )
-                    )
+    workflow.add_node("agent", _agent_step)
+    workflow.add_node("tools", _tool_step)
 
-            state["messages"] = messages
+    workflow.set_entry_point("agent")
 
-            return state
+    workflow.add_conditional_edges(
+        "agent",
+        _route,
+        {
+            "tools": "tools",
+            END: END,
+        },
+    )
 
-        workflow = StateGraph(AgentState)
+    workflow.add_edge("tools", "agent")
 
-        workflow.add_node("agent", agent_node)
-        workflow.add_node("tools", tool_node)
+    return workflow.compile()
 
-        workflow.set_entry_point("agent")
 
-        workflow.add_conditional_edges(
-            "agent",
-            should_continue,
-            {
-                "tools": "tools",
-                END: END,
-            },
-        )
+_AGENT_APP = _compile_agent_graph()
 
-        workflow.add_edge("tools", "agent")
 
-        app = workflow.compile()
+def clear_app_cache() -> None:
+    """Drop cached agent nodes and the LLM clients they hold."""
+    _build_nodes.cache_clear()
+
+
+class LangGraphAdapter(AgentFramework):
+    name = "langgraph"
+
+    logger = logging.getLogger(__name__)
+
+    async def execute(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        context: Dict[str, Any],
+        llm_override: Optional[LLMOverride] = None,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        steps: List[Step] = []
+        app, initial_state, run_config = self._prepare(agent_config, user_input, llm_override, steps)
+
+        final_state = await app.ainvoke(initial_state, config=run_config)
+
+        last = final_state.get("last_response")
+        final_output = last.content if isinstance(last, AIMessage) else ""
+
+        return final_output, [step.as_dict() for step in steps]
+
+    async def execute_stream(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        context: Dict[str, Any],
+        llm_override: Optional[LLMOverride] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``token`` events from the model stream, ``step`` events after each node, then ``result``."""
+        steps: List[Step] = []
+        app, initial_state, run_config = self._prepare(agent_config, user_input, llm_override, steps)
+
+        emitted = 0
+        last = None
+        streamed = False
+        async for mode, payload in app.astream(initial_state, config=run_config, stream_mode=["messages", "updates"]):
+            if mode == "messages":
+                chunk, metadata = payload
+                # Only the agent's own model; LLM calls made inside tools stream under the "tools" node.
+                if metadata.get("langgraph_node") != "agent":
+                    continue
+                if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str) and chunk.content:
+                    streamed = True
+                    yield {"type": "token", "content": chunk.content}
+                continue
+
+            agent_update = payload.get("agent")
+            if agent_update:
+                last = agent_update.get("last_response", last)
+                # LLM cache hits never reach the model stream, so send the cached content as one token.
+                if not streamed and isinstance(last, AIMessage) and isinstance(last.content, str) and last.content:
+                    yield {"type": "token", "content": last.content}
+                streamed = False
+            for step in steps[emitted:]:
+                yield {"type": "step", "data": step.as_dict()}
+            emitted = len(steps)
+
+        yield {"type": "result", "output": last.content if isinstance(last, AIMessage) else ""}
+
+    def _prepare(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        llm_override: Optional[LLMOverride],
+        steps: List[Step],
+    ) -> Tuple[Any, Dict[str, Any], Dict[str, Any]]:
+        """Return the compiled app, initial state and run config for one execution."""
+        nodes = _build_nodes(
+            _IdentityKey(agent_config),
+            llm_override.model_dump_json() if llm_override else None,
+            tuple(_IdentityKey(tool_config) for tool_config in YAMLService.load_tools(agent_config.tools)),
+            asyncio.get_running_loop(),
+        )
 
         initial_state = {
-            "messages": [],
+            "messages": [
+                SystemMessage(content=agent_config.system_prompt),
+                HumanMessage(content=user_input),
+            ],
             "iteration": 0,
-            "context": context,
         }
 
         recursion_limit = max(agent_config.max_iterations * 10, 50)
@@ -230,13 +372,8 @@ class LangGraphAdapter(AgentFramework):
             agent_config.max_iterations,
         )
 
-        final_state = await app.ainvoke(initial_state, config={"recursion_limit": recursion_limit})
-
-        messages = final_state.get("messages", [])
-        final_output = ""
-        for msg in reversed(messages):
-            if isinstance(msg, AIMessage):
-                final_output = msg.content
-                break
-
-        return final_output, steps
+        run_config = {
+            "recursion_limit": recursion_limit,
+            "configurable": {"steps": steps, "nodes": nodes},
+        }
+        return _AGENT_APP, initial_state, run_config
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+from app.models import AgentConfig, LLMOverride
+from app.services.agent_frameworks.openai_direct_adapter import OpenAIDirectAdapter, get_async_client
+from app.services.llm_service import LLMService
+
+_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class OpenAIBatchAdapter(OpenAIDirectAdapter):
+    """OpenAI-direct agent that can also submit many inputs through the Batch API.
+
+    Single executions behave like ``openai_direct``. ``execute_batch`` trades latency
+    (up to the 24h completion window) for the Batch API's lower token price and only
+    supports tool-free agents, since each input gets exactly one completion.
+    """
+
+    name = "openai_batch"
+
+    logger = logging.getLogger(__name__)
+
+    async def execute_batch(
+        self,
+        agent_config: AgentConfig,
+        inputs: List[str],
+        llm_override: Optional[LLMOverride] = None,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0,
+        max_wait: Optional[float] = None,
+    ) -> List[Tuple[str, List[Dict[str, Any]], Optional[str]]]:
+        """Run one completion per input via the Batch API; returns ``(output, steps, error)`` per input.
+
+        Batches still running after ``max_wait`` seconds (default ``settings.openai_batch_max_wait``)
+        are cancelled and raise ``TimeoutError``, so a request never waits out the 24h window.
+        """
+        if agent_config.tools:
+            raise ValueError("The OpenAI Batch API path does not support agents with tools")
+
+        llm_config = LLMService.resolve_llm_config(agent_config.llm_config, llm_override)
+        client = get_async_client(
+            llm_config.api_key or settings.llm_api_key,
+            llm_config.base_url or settings.llm_base_url,
+            asyncio.get_running_loop(),
+        )
+        request_params = LLMService.get_request_params(llm_config)
+
+        lines = [
+            orjson.dumps(
+                {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": llm_config.model,
+                        "messages": [
+                            {"role": "system", "content": agent_config.system_prompt},
+                            {"role": "user", "content": user_input},
+                        ],
+                        **request_params,
+                    },
+                }
+            )
+            for index, user_input in enumerate(inputs)
+        ]
+        batch_file = await client.files.create(file=("batch.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        self.logger.info("Submitted OpenAI batch %s with %d requests", batch.id, len(inputs))
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (settings.openai_batch_max_wait if max_wait is None else max_wait)
+        delay = poll_interval
+        while batch.status not in _TERMINAL_STATUSES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                try:
+                    await client.batches.cancel(batch.id)
+                except Exception as exc:
+                    self.logger.warning("Failed to cancel OpenAI batch %s: %s", batch.id, exc)
+                raise TimeoutError(f"OpenAI batch {batch.id} did not finish within the wait limit and was cancelled")
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status '{batch.status}'")
+
+        records: Dict[str, Dict[str, Any]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    record = orjson.loads(line)
+                    records[record["custom_id"]] = record
+
+        results: List[Tuple[str, List[Dict[str, Any]], Optional[str]]] = []
+        for index in range(len(inputs)):
+            record = records.get(str(index))
+            response = (record or {}).get("response") or {}
+            if not record or record.get("error") or response.get("status_code") != 200:
+                error = (record or {}).get("error") or response.get("body") or "No result returned by batch"
+                results.append(("", [], str(error)))
+                continue
+            output = response["body"]["choices"][0]["message"].get("content") or ""
+            results.append((output, [{"type": "reasoning", "content": output, "tool_calls": [], "iteration": 0}], None))
+        return results
@@ -1,18 +1,93 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Tuple, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Tuple, Optional
 
 import httpx
+import orjson
 
 from app.config import settings
 from app.models import AgentConfig, LLMOverride
 from app.services.agent_frameworks.base import AgentFramework
-from app.services.llm_service import LLMService
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_service import LLMService, _astrip_extra_headers
 from app.services.tool_service import ToolService
-from app.services.yaml_service import YAMLService
+
+
+@lru_cache(maxsize=1)
+def _get_openai_module():
+    """Resolve the openai module once, preferring the Langfuse wrapper when enabled."""
+    logger = OpenAIDirectAdapter.logger
+    if settings.langfuse_enabled:
+        try:
+            from langfuse.openai import openai as langfuse_openai
+
+            if settings.langfuse_public_key:
+                os.environ.setdefault("LANGFUSE_PUBLIC_KEY", settings.langfuse_public_key)
+            if settings.langfuse_secret_key:
+                os.environ.setdefault("LANGFUSE_SECRET_KEY", settings.langfuse_secret_key)
+            if settings.langfuse_host:
+                os.environ.setdefault("LANGFUSE_HOST", settings.langfuse_host)
+
+            logger.debug("Langfuse OpenAI wrapper enabled for openai_direct")
+            return langfuse_openai
+        except Exception as exc:
+            logger.warning("Langfuse OpenAI wrapper disabled: %s", exc)
+
+    try:
+        import openai as native_openai
+    except ImportError as exc:
+        raise ImportError(
+            "openai package is required for openai_direct framework. Install with 'pip install openai'."
+        ) from exc
+    return native_openai
+
+
+# Pooled AsyncOpenAI clients by (api_key, base_url, event loop), least recently used first.
+_ASYNC_CLIENTS: "OrderedDict[Tuple[str, Optional[str], asyncio.AbstractEventLoop], Any]" = OrderedDict()
+_MAX_ASYNC_CLIENTS = 32
+
+
+def get_async_client(api_key: str, base_url: Optional[str], loop: asyncio.AbstractEventLoop):
+    """Return a connection-pooled AsyncOpenAI client, built once per credentials and event loop."""
+    key = (api_key, base_url, loop)
+    client = _ASYNC_CLIENTS.get(key)
+    if client is not None:
+        _ASYNC_CLIENTS.move_to_end(key)
+        return client
+
+    http_client = httpx.AsyncClient(
+        verify=settings.ssl_verify,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+        ),
+        event_hooks={"request": [_astrip_extra_headers]},
+    )
+    client = _get_openai_module().AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=http_client,
+    )
+    _ASYNC_CLIENTS[key] = client
+    if len(_ASYNC_CLIENTS) > _MAX_ASYNC_CLIENTS:
+        # Evicted clients may still be serving a request, so they are dropped rather than closed.
+        _ASYNC_CLIENTS.popitem(last=False)
+    return client
+
+
+async def close_client_cache() -> None:
+    """Close the cached OpenAI clients built on the running loop and drop the rest."""
+    loop = asyncio.get_running_loop()
+    for (_, _, client_loop), client in list(_ASYNC_CLIENTS.items()):
+        # Pools can only be closed from the loop that opened them.
+        if client_loop is loop:
+            await client.close()
+    _ASYNC_CLIENTS.clear()
 
 
 class OpenAIDirectAdapter(AgentFramework):
@@ -27,140 +102,148 @@ class OpenAIDirectAdapter(AgentFramework):
         context: Dict[str, Any],
         llm_override: Optional[LLMOverride] = None,
     ) -> Tuple[str, List[Dict[str, Any]]]:
-        openai_module = None
-
-        if settings.langfuse_enabled:
-            try:
-                from langfuse.openai import openai as langfuse_openai
-
-                if settings.langfuse_public_key:
-                    os.environ.setdefault("LANGFUSE_PUBLIC_KEY", settings.langfuse_public_key)
-                if settings.langfuse_secret_key:
-                    os.environ.setdefault("LANGFUSE_SECRET_KEY", settings.langfuse_secret_key)
-                if settings.langfuse_host:
-                    os.environ.setdefault("LANGFUSE_HOST", settings.langfuse_host)
-
-                openai_module = langfuse_openai
-                self.logger.debug("Langfuse OpenAI wrapper enabled for openai_direct")
-            except Exception as exc:
-                self.logger.warning("Langfuse OpenAI wrapper disabled: %s", exc)
+        steps: List[Dict[str, Any]] = []
+        final_output = ""
+        async for event in self._run(agent_config, user_input, llm_override, stream_tokens=False):
+            if event["type"] == "step":
+                steps.append(event["data"])
+            else:
+                final_output = event["output"]
+        return final_output, steps
 
-        try:
-            if openai_module is None:
-                import openai as native_openai
-                openai_module = native_openai
-        except ImportError as exc:
-            raise ImportError(
-                "openai package is required for openai_direct framework. Install with 'pip install openai'."
-            ) from exc
+    async def execute_stream(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        context: Dict[str, Any],
+        llm_override: Optional[LLMOverride] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``token`` events as the model streams, ``step`` events per turn and tool call, then ``result``."""
+        async for event in self._run(agent_config, user_input, llm_override, stream_tokens=True):
+            yield event
 
+    async def _run(
+        self,
+        agent_config: AgentConfig,
+        user_input: str,
+        llm_override: Optional[LLMOverride],
+        stream_tokens: bool,
+    ) -> AsyncIterator[Dict[str, Any]]:
         llm_config = LLMService.resolve_llm_config(agent_config.llm_config, llm_override)
         api_key = llm_config.api_key or settings.llm_api_key
         base_url = llm_config.base_url or settings.llm_base_url
+        client = get_async_client(api_key, base_url, asyncio.get_running_loop())
+
+        request_params = LLMService.get_request_params(llm_config)
 
-        def _strip_extra_headers(request: httpx.Request) -> None:
-            for header in list(request.headers.keys()):
-                header_lower = header.lower()
-                if header_lower == "x-stainless-raw-response":
-                    continue
-                if header_lower.startswith("x-stainless-"):
-                    request.headers.pop(header, None)
-
-        http_client = httpx.Client(
-            verify=settings.ssl_verify,
-            event_hooks={"request": [_strip_extra_headers]},
-        )
-
-        client = openai_module.OpenAI(
-            api_key=api_key,
-            base_url=base_url,
-            http_client=http_client,
-        )
-
-        reserved_keys = {
-            "model",
-            "api_key",
-            "base_url",
-            "temperature",
-            "max_tokens",
-            "extra_headers",
-        }
-        extra_params = {
-            key: value
-            for key, value in (llm_config.additional_params or {}).items()
-            if key not in reserved_keys
-        }
-        request_params = {
-            "temperature": llm_config.temperature,
-            "max_tokens": llm_config.max_tokens,
-            **extra_params,
-        }
-        request_params.pop("extra_headers", None)
-
-        tool_schemas: List[Dict[str, Any]] = []
-        tool_lookup: Dict[str, str] = {}
-        for tool_name in agent_config.tools:
-            tool_config = YAMLService.load_tool(tool_name)
-            if not tool_config:
-                continue
-            tool_schemas.append(ToolService.get_tool_schema(tool_config))
-            tool_lookup[tool_config.name] = tool_config.description
+        tool_schemas = ToolService.get_tool_schemas(agent_config.tools)
 
         messages: List[Dict[str, Any]] = [
             {"role": "system", "content": agent_config.system_prompt},
             {"role": "user", "content": user_input},
         ]
 
-        steps: List[Dict[str, Any]] = []
         final_output = ""
+        cache = get_llm_cache()
 
         for iteration in range(agent_config.max_iterations):
-            if settings.debug_trace:
+            if settings.debug_trace and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(
                     "OpenAI Direct request: %s",
-                    json.dumps(
+                    orjson.dumps(
                         {
                             "provider": llm_config.provider,
                             "model": llm_config.model,
                             "messages": messages,
-                            "tool_names": list(tool_lookup.keys()),
+                            "tool_names": [schema["function"]["name"] for schema in tool_schemas],
                             "iteration": iteration,
                         },
                         default=str,
-                    ),
+                        option=orjson.OPT_NON_STR_KEYS,
+                    ).decode(),
                 )
 
-            response = client.chat.completions.create(
-                model=llm_config.model,
-                messages=messages,
-                tools=tool_schemas or None,
-                **request_params,
+            cache_key = (
+                cache.cache_key(llm_config.model, messages, tool_schemas, base_url=base_url, **request_params)
+                if cache
+                else None
             )
+            cached = await cache.get(cache_key) if cache_key else None
+
+            if cached is not None:
+                content, tool_calls = cached["content"], cached["tool_calls"]
+                if stream_tokens and content:
+                    yield {"type": "token", "content": content}
+            elif stream_tokens:
+                response = await client.chat.completions.create(
+                    model=llm_config.model,
+                    messages=messages,
+                    tools=tool_schemas or None,
+                    stream=True,
+                    **request_params,
+                )
 
-            message = response.choices[0].message
-            content = message.content or ""
-            tool_calls = []
-            if getattr(message, "tool_calls", None):
-                for call in message.tool_calls:
-                    tool_calls.append(
-                        {
-                            "id": call.id,
-                            "type": call.type,
-                            "function": {
-                                "name": call.function.name,
-                                "arguments": call.function.arguments,
-                            },
-                        }
-                    )
-
-            steps.append(
-                {
+                content_parts: List[str] = []
+                calls_by_index: Dict[int, Dict[str, Any]] = {}
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield {"type": "token", "content": delta.content}
+                    # Tool calls arrive as fragments keyed by index; names and arguments are concatenated.
+                    for call in delta.tool_calls or []:
+                        entry = calls_by_index.setdefault(
+                            call.index,
+                            {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                        )
+                        if call.id:
+                            entry["id"] = call.id
+                        if call.type:
+                            entry["type"] = call.type
+                        if call.function is not None:
+                            entry["function"]["name"] += call.function.name or ""
+                            entry["function"]["arguments"] += call.function.arguments or ""
+
+                content = "".join(content_parts)
+                tool_calls = [calls_by_index[index] for index in sorted(calls_by_index)]
+            else:
+                response = await client.chat.completions.create(
+                    model=llm_config.model,
+                    messages=messages,
+                    tools=tool_schemas or None,
+                    **request_params,
+                )
+
+                message = response.choices[0].message
+                content = message.content or ""
+                tool_calls = []
+                if getattr(message, "tool_calls", None):
+                    for call in message.tool_calls:
+                        tool_calls.append(
+                            {
+                                "id": call.id,
+                                "type": call.type,
+                                "function": {
+                                    "name": call.function.name,
+                                    "arguments": call.function.arguments,
+                                },
+                            }
+                        )
+
+            if cached is None and cache_key:
+                await cache.set(cache_key, {"content": content, "tool_calls": tool_calls})
+
+            yield {
+                "type": "step",
+                "data": {
                     "type": "reasoning",
                     "content": content,
                     "tool_calls": tool_calls,
                     "iteration": iteration,
-                }
-            )
+                },
+            }
 
             assistant_message: Dict[str, Any] = {"role": "assistant", "content": content}
             if tool_calls:
@@ -170,25 +253,34 @@ class OpenAIDirectAdapter(AgentFramework):
             final_output = content or final_output
 
             if not tool_calls:
-                return final_output, steps
+                break
 
+            parsed_calls = []
             for tool_call in tool_calls:
-                tool_name = tool_call["function"]["name"]
                 raw_args = tool_call["function"].get("arguments") or "{}"
                 try:
-                    parsed_args = json.loads(raw_args)
+                    parsed_args = orjson.loads(raw_args)
                     if not isinstance(parsed_args, dict):
                         parsed_args = {"value": parsed_args}
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     parsed_args = {"_raw": raw_args}
+                parsed_calls.append((tool_call["function"]["name"], parsed_args))
 
-                tool_result = await ToolService.execute_tool(tool_name, parsed_args, llm_override, llm_config)
+            tool_results = await ToolService.execute_tool_calls(
+                parsed_calls, agent_config.tool_execution_strategy, llm_override, llm_config
+            )
+
+            for tool_call, (tool_name, _), tool_result in zip(tool_calls, parsed_calls, tool_results):
                 if tool_result.success:
                     tool_content: Any = tool_result.result
                 else:
                     tool_content = {"error": tool_result.error}
 
-                tool_payload = tool_content if isinstance(tool_content, str) else json.dumps(tool_content, default=str)
+                tool_payload = (
+                    tool_content
+                    if isinstance(tool_content, str)
+                    else orjson.dumps(tool_content, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+                )
 
                 messages.append(
                     {
@@ -198,14 +290,15 @@ class OpenAIDirectAdapter(AgentFramework):
                     }
                 )
 
-                steps.append(
-                    {
+                yield {
+                    "type": "step",
+                    "data": {
                         "type": "tool",
                         "tool": tool_name,
                         "tool_call_id": tool_call["id"],
                         "result": tool_result.result if tool_result.success else None,
                         "error": None if tool_result.success else tool_result.error,
-                    }
-                )
+                    },
+                }
 
-        return final_output, steps
+        yield {"type": "result", "output": final_output}
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 
 from app.services.agent_frameworks.base import AgentFramework
 
+ExecuteFn = Callable[..., Awaitable[Tuple[str, List[Dict[str, Any]]]]]
+
 
 class FrameworkRegistry:
+    __slots__ = ("_frameworks", "_dispatch", "_frozen")
+
     def __init__(self) -> None:
         self._frameworks: Dict[str, AgentFramework] = {}
+        # Bound ``execute`` methods, so the hot path is one lookup and one await.
+        self._dispatch: Dict[str, ExecuteFn] = {}
+        self._frozen = False
 
     def register(self, framework: AgentFramework) -> None:
+        if self._frozen:
+            raise RuntimeError("Framework registry is frozen")
         self._frameworks[framework.name] = framework
+        self._dispatch[framework.name] = framework.execute
+
+    def freeze(self) -> None:
+        """Stop accepting registrations once all adapters are registered."""
+        self._frameworks = MappingProxyType(self._frameworks)
+        self._dispatch = MappingProxyType(self._dispatch)
+        self._frozen = True
 
     def get(self, name: str) -> AgentFramework:
-        if name not in self._frameworks:
+        try:
+            return self._frameworks[name]
+        except KeyError:
+            raise ValueError(f"Unsupported framework: {name}") from None
+
+    def get_execute(self, name: str) -> ExecuteFn:
+        """Return the bound ``execute`` method of the named framework."""
+        execute = self._dispatch.get(name)
+        if execute is None:
             raise ValueError(f"Unsupported framework: {name}")
-        return self._frameworks[name]
+        return execute
 
 
 framework_registry = FrameworkRegistry()
@@ -1,12 +1,12 @@
+import asyncio
 import time
-import json
 import logging
-from typing import Dict, Any, Optional
+import orjson
+from typing import Dict, Any, List, Optional, AsyncIterator
 
 from app.models import AgentExecutionResponse, LLMOverride
 from app.services.yaml_service import YAMLService
 from app.services.agent_frameworks import framework_registry
-from app.services.llm_service import LLMService
 from app.config import settings
 
 
@@ -23,54 +23,50 @@ class AgentService:
         framework_override: Optional[str] = None,
     ) -> AgentExecutionResponse:
         """Execute an agent by name with given input."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         context = context or {}
         
-        AgentService.logger.debug(f"Executing agent: {agent_name}")
+        AgentService.logger.debug("Executing agent: %s", agent_name)
 
-        if settings.debug_trace:
+        if settings.debug_trace and AgentService.logger.isEnabledFor(logging.DEBUG):
             AgentService.logger.debug(
                 "Agent request: %s",
-                json.dumps(
+                orjson.dumps(
                     {"agent_name": agent_name, "input": user_input, "context": context},
                     default=str,
-                ),
+                    option=orjson.OPT_NON_STR_KEYS,
+                ).decode(),
             )
         
         agent_config = YAMLService.load_agent(agent_name)
         if not agent_config:
-            AgentService.logger.warning(f"Agent not found: {agent_name}")
+            AgentService.logger.warning("Agent not found: %s", agent_name)
             return AgentExecutionResponse(
                 agent_name=agent_name,
                 success=False,
                 output="",
                 steps=[],
                 error=f"Agent '{agent_name}' not found",
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
         
         try:
-            AgentService.logger.debug(f"Agent framework: {agent_config.framework}, tools: {agent_config.tools}")
-            if llm_override:
-                agent_config = agent_config.model_copy(
-                    update={
-                        "llm_config": LLMService.resolve_llm_config(
-                            agent_config.llm_config,
-                            llm_override,
-                        )
-                    }
-                )
+            AgentService.logger.debug("Agent framework: %s, tools: %s", agent_config.framework, agent_config.tools)
+            # Frameworks resolve llm_override themselves, so the shared YAMLService instance is passed
+            # through as-is and stays usable as an identity cache key.
             selected_framework = framework_override or agent_config.framework
-            framework = framework_registry.get(selected_framework)
-            output, steps = await framework.execute(agent_config, user_input, context, llm_override)
+            execute = framework_registry.get_execute(selected_framework)
+            output, steps = await execute(agent_config, user_input, context, llm_override)
 
-            execution_time = time.time() - start_time
-            AgentService.logger.debug(f"Agent executed successfully: {agent_name} (took {execution_time:.3f}s, {len(steps)} steps)")
+            execution_time = time.perf_counter() - start_time
+            AgentService.logger.debug(
+                "Agent executed successfully: %s (took %.3fs, %d steps)", agent_name, execution_time, len(steps)
+            )
             
-            if settings.debug_trace:
+            if settings.debug_trace and AgentService.logger.isEnabledFor(logging.DEBUG):
                 AgentService.logger.debug(
                     "Agent response: %s",
-                    json.dumps(
+                    orjson.dumps(
                         {
                             "agent_name": agent_name,
                             "output": output,
@@ -78,7 +74,8 @@ class AgentService:
                             "execution_time": execution_time,
                         },
                         default=str,
-                    ),
+                        option=orjson.OPT_NON_STR_KEYS,
+                    ).decode(),
                 )
             
             return AgentExecutionResponse(
@@ -90,13 +87,145 @@ class AgentService:
                 execution_time=execution_time
             )
         except Exception as e:
-            AgentService.logger.error(f"Agent execution failed: {agent_name} - {str(e)}")
+            AgentService.logger.error("Agent execution failed: %s - %s", agent_name, e)
             return AgentExecutionResponse(
                 agent_name=agent_name,
                 success=False,
                 output="",
                 steps=[],
                 error=str(e),
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
-    
+
+    @staticmethod
+    async def execute_agent_batch(
+        agent_name: str,
+        inputs: List[str],
+        context: Dict[str, Any] = None,
+        llm_override: Optional[LLMOverride] = None,
+        framework_override: Optional[str] = None,
+        concurrency: int = 10,
+        use_batch_api: bool = False,
+    ) -> List[AgentExecutionResponse]:
+        """Execute an agent over many inputs, at most ``concurrency`` at a time, preserving input order.
+
+        With ``use_batch_api``, tool-free agents on a framework that supports it (``openai_batch``)
+        are submitted as one provider batch instead.
+        """
+        AgentService.logger.debug("Batch executing agent: %s (%d inputs)", agent_name, len(inputs))
+        if use_batch_api:
+            responses = await AgentService._execute_via_batch_api(
+                agent_name, inputs, llm_override, framework_override
+            )
+            if responses is not None:
+                return responses
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(user_input: str) -> AgentExecutionResponse:
+            async with semaphore:
+                return await AgentService.execute_agent(
+                    agent_name, user_input, context, llm_override, framework_override
+                )
+
+        return list(await asyncio.gather(*(run_one(user_input) for user_input in inputs)))
+
+    @staticmethod
+    async def _execute_via_batch_api(
+        agent_name: str,
+        inputs: List[str],
+        llm_override: Optional[LLMOverride],
+        framework_override: Optional[str],
+    ) -> Optional[List[AgentExecutionResponse]]:
+        """Run a batch through the framework's provider Batch API, or return None if it cannot."""
+        agent_config = YAMLService.load_agent(agent_name)
+        if not agent_config:
+            return None
+        framework = framework_registry.get(framework_override or agent_config.framework)
+        if not hasattr(framework, "execute_batch") or agent_config.tools:
+            AgentService.logger.warning(
+                "Batch API unavailable for agent %s (framework %s, %d tools); running concurrently",
+                agent_name,
+                framework.name,
+                len(agent_config.tools),
+            )
+            return None
+
+        start_time = time.perf_counter()
+        try:
+            results = await framework.execute_batch(agent_config, inputs, llm_override)
+        except Exception as e:
+            AgentService.logger.error("Batch API execution failed: %s - %s", agent_name, e)
+            results = [("", [], str(e))] * len(inputs)
+
+        execution_time = time.perf_counter() - start_time
+        return [
+            AgentExecutionResponse(
+                agent_name=agent_name,
+                success=error is None,
+                output=output,
+                steps=steps,
+                error=error,
+                execution_time=execution_time,
+            )
+            for output, steps, error in results
+        ]
+
+    @staticmethod
+    async def execute_agent_stream(
+        agent_name: str,
+        user_input: str,
+        context: Dict[str, Any] = None,
+        llm_override: Optional[LLMOverride] = None,
+        framework_override: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute an agent and yield step events as they occur, then a final result event."""
+        start_time = time.perf_counter()
+        context = context or {}
+
+        AgentService.logger.debug("Streaming agent: %s", agent_name)
+
+        agent_config = YAMLService.load_agent(agent_name)
+        if not agent_config:
+            AgentService.logger.warning("Agent not found: %s", agent_name)
+            yield {
+                "type": "result",
+                "agent_name": agent_name,
+                "success": False,
+                "output": "",
+                "error": f"Agent '{agent_name}' not found",
+                "execution_time": time.perf_counter() - start_time,
+            }
+            return
+
+        output = ""
+        try:
+            # Frameworks resolve llm_override themselves, so the shared YAMLService instance is passed
+            # through as-is and stays usable as an identity cache key.
+            selected_framework = framework_override or agent_config.framework
+            framework = framework_registry.get(selected_framework)
+            async for event in framework.execute_stream(agent_config, user_input, context, llm_override):
+                if event["type"] == "result":
+                    output = event["output"]
+                else:
+                    yield event
+        except Exception as e:
+            AgentService.logger.error("Agent execution failed: %s - %s", agent_name, e)
+            yield {
+                "type": "result",
+                "agent_name": agent_name,
+                "success": False,
+                "output": "",
+                "error": str(e),
+                "execution_time": time.perf_counter() - start_time,
+            }
+            return
+
+        yield {
+            "type": "result",
+            "agent_name": agent_name,
+            "success": True,
+            "output": output,
+            "error": None,
+            "execution_time": time.perf_counter() - start_time,
+        }
@@ -1,21 +1,456 @@
+import asyncio
 import time
 import logging
-import os
 import re
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from contextlib import aclosing
+from contextvars import ContextVar
+from functools import lru_cache, partial
+from typing import Annotated, Dict, Any, List, Optional, Callable, AsyncIterator, NamedTuple, Set, Tuple
 
+import orjson
 from langgraph.graph import StateGraph, END
-
-import json
-
-from app.models import GraphConfig, GraphNodeType, GraphExecutionResponse, GraphEdgeType, GraphType, LLMOverride
+from langgraph.types import Send
+
+from app.models import (
+    AgentConfig,
+    GraphConfig,
+    GraphEdgeType,
+    GraphExecutionResponse,
+    GraphNodeType,
+    GraphType,
+    LLMOverride,
+    ToolConfig,
+)
 from app.services.yaml_service import YAMLService
 from app.services.agent_service import AgentService
-from app.services.tool_service import ToolService
+from app.services.tool_service import ToolService, _IdentityKey
 from app.services.llm_service import LLMService
+from app.services.agent_frameworks.google_adk_adapter import load_adk, set_google_api_key
 from app.config import settings
 
 
+class _GraphRun(NamedTuple):
+    context: Dict[str, Any]
+    llm_override: Optional[LLMOverride]
+    # Step sink for this run: the caller's on_step, or the list returned in the response.
+    record_step: Callable[[Dict[str, Any]], None]
+
+
+_Resolver = Callable[[Dict[str, Any]], Any]
+
+_TPL_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Graph configs name the terminal node "END"; map it to LangGraph's sentinel so checks can use identity.
+_END_ALIAS = {"END": END}
+
+# Per-invocation values live here so the cached, compiled graphs stay free of request state.
+_graph_run: ContextVar[_GraphRun] = ContextVar("graph_run")
+
+
+def _merge_state(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer for the graph state so nodes running in the same step can all write to it."""
+    return {**current, **update}
+
+
+@lru_cache(maxsize=4096)
+def _compile_path(path: str) -> _Resolver:
+    """Build a state accessor for ``path`` once, with fast paths for the common shallow ``$.`` paths."""
+    if not path.startswith("$."):
+        return lambda state: state.get(path, path)
+    parts = tuple(path[2:].split("."))
+    if len(parts) == 1:
+        (key,) = parts
+        return lambda state: state.get(key)
+    if len(parts) == 2:
+        first, second = parts
+
+        def get_nested(state: Dict[str, Any]) -> Any:
+            value = state.get(first)
+            return value.get(second) if isinstance(value, dict) else None
+
+        return get_nested
+
+    def get_deep(state: Dict[str, Any]) -> Any:
+        value: Any = state
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    return get_deep
+
+
+def _compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """Split a ``{{ key }}`` template once into literal text and placeholders for fast rendering."""
+    pieces: List[Tuple[str, str, str]] = []
+    position = 0
+    for match in _TPL_RE.finditer(template):
+        pieces.append((template[position : match.start()], match.group(1), match.group(0)))
+        position = match.end()
+    tail = template[position:]
+
+    def render(state: Dict[str, Any]) -> str:
+        parts: List[str] = []
+        for literal, key, placeholder in pieces:
+            parts.append(literal)
+            # Placeholders without a matching state key are left as written.
+            parts.append(str(state[key]) if key in state else placeholder)
+        parts.append(tail)
+        return "".join(parts)
+
+    return render
+
+
+def _compile_value(value: Any) -> _Resolver:
+    """Classify a mapping value once and return the callable that resolves it against state."""
+    if not isinstance(value, str):
+        return lambda state: value
+    if "{{" in value:
+        get_value = _compile_path(value)
+        render = _compile_template(value)
+
+        def resolve_template(state: Dict[str, Any]) -> Any:
+            resolved = get_value(state)
+            return render(state) if resolved == value else resolved
+
+        return resolve_template
+
+    return _compile_path(value)
+
+
+_Mapping = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _pass_through(state: Dict[str, Any]) -> Dict[str, Any]:
+    return state
+
+
+def _compile_mapping(mapping: Dict[str, Any]) -> _Mapping:
+    """Pre-resolve a mapping into a callable specialized for empty, constant, single-key and general mappings."""
+    if not mapping:
+        return _pass_through
+    if not any(isinstance(value, str) for value in mapping.values()):
+        # Only literals: copy the whole dict in C instead of resolving key by key.
+        constant = dict(mapping)
+        return lambda state: constant.copy()
+    if len(mapping) == 1:
+        ((key, value),) = mapping.items()
+        resolve = _compile_value(value)
+        return lambda state: {key: resolve(state)}
+    resolvers = [(key, _compile_value(value)) for key, value in mapping.items()]
+    return lambda state: {key: resolve(state) for key, resolve in resolvers}
+
+
+def _compile_tool_inputs(input_mapping: Dict[str, Any], payload: Dict[str, Any]) -> _Mapping:
+    """Fuse a tool node's ``config.payload`` defaults and input mapping; mapped keys win."""
+    if not payload:
+        return _compile_mapping(input_mapping)
+    if input_mapping:
+        return _compile_mapping({**payload, **input_mapping})
+    # An empty input mapping passes the whole state, so it can only be merged at run time.
+    resolve_payload = _compile_mapping(payload)
+    return lambda state: resolve_payload(state) | state
+
+
+class _RuntimeNode(NamedTuple):
+    """Plain-attribute snapshot of a graph node, so node runners skip pydantic access per call."""
+
+    id: str
+    agent_id: Optional[str]
+    tool_id: Optional[str]
+    inputs: _Mapping
+    outputs: _Mapping
+    agent_input: Callable[[Dict[str, Any]], Any]
+    # Reused {"response": ...} source for the output mapping; see _response_update.
+    scratch: Dict[str, Any]
+
+
+def _response_update(node: _RuntimeNode, response: Any) -> Dict[str, Any]:
+    """Map a node result through its output mapping into a state update, reusing the node's scratch dict.
+
+    Sharing the scratch dict between concurrent runs is safe because nothing awaits while it is filled.
+    """
+    node.scratch["response"] = response
+    try:
+        update = node.outputs(node.scratch)
+        # An empty output mapping hands back the scratch dict itself, which is reset below.
+        return update.copy() if update is node.scratch else update
+    finally:
+        node.scratch["response"] = None
+
+
+def _agent_input_chain(payload: Dict[str, Any]) -> Any:
+    return payload.get("prompt") or payload.get("message") or payload
+
+
+def _compile_agent_input(input_mapping: Dict[str, Any]) -> Callable[[Dict[str, Any]], Any]:
+    """Pick how an agent node's input is taken from its mapped payload, using the mapping's keys."""
+    if not input_mapping or ("prompt" in input_mapping and "message" in input_mapping):
+        # Payload keys are only known at run time (or both are mapped), so keep the full lookup chain.
+        return _agent_input_chain
+    for key in ("prompt", "message"):
+        if key in input_mapping:
+            return lambda payload: payload[key] or payload
+    return lambda payload: payload
+
+
+def _no_value(state: Dict[str, Any]) -> None:
+    return None
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _compile_router(routes: List[Tuple[Optional[str], Any, str]]) -> Callable[[Dict[str, Any]], str]:
+    """Build the router for one source's conditional edges, given as ``(condition, value, target)``.
+
+    Edges are checked in order. When they all test the same path and every valued edge comes before the
+    truthy ones, that order is captured by a ``value -> target`` table plus the first truthy target.
+    """
+    valued = [route for route in routes if route[1] is not None]
+    conditions = {condition for condition, _, _ in routes}
+    if len(conditions) == 1 and routes[: len(valued)] == valued and all(_is_hashable(v) for _, v, _ in valued):
+        condition = conditions.pop()
+        get_value = _compile_path(condition) if condition else _no_value
+        table: Dict[Any, str] = {}
+        for _, condition_value, target in valued:
+            table.setdefault(condition_value, target)
+        truthy_target = routes[len(valued)][2] if len(routes) > len(valued) else END
+
+        def route_by_table(state: Dict[str, Any]) -> str:
+            value = get_value(state)
+            try:
+                target = table.get(value)
+            except TypeError:
+                target = None
+            if target is not None:
+                return target
+            return truthy_target if value else END
+
+        return route_by_table
+
+    checks = [(_compile_path(condition) if condition else _no_value, value, target) for condition, value, target in routes]
+
+    def route(state: Dict[str, Any]) -> str:
+        for get_value, condition_value, target in checks:
+            value = get_value(state)
+            if condition_value is not None:
+                if value == condition_value:
+                    return target
+            elif value:
+                return target
+        return END
+
+    return route
+
+
+async def _run_agent(state: Dict[str, Any], node: _RuntimeNode) -> Dict[str, Any]:
+    run = _graph_run.get()
+    agent_input = node.agent_input(node.inputs(state))
+    if not isinstance(agent_input, str):
+        agent_input = str(agent_input)
+    result = await AgentService.execute_agent(node.agent_id, agent_input, run.context, run.llm_override)
+    if not result.success:
+        raise RuntimeError(result.error or "Agent execution failed")
+    run.record_step({"type": "agent", "node": node.id, "agent": node.agent_id, "output": result.output})
+    return _response_update(node, result.output)
+
+
+async def _run_tool(state: Dict[str, Any], node: _RuntimeNode) -> Dict[str, Any]:
+    run = _graph_run.get()
+    result = await ToolService.execute_tool(node.tool_id, node.inputs(state), run.llm_override)
+    if not result.success:
+        raise RuntimeError(result.error or "Tool execution failed")
+    run.record_step({"type": "tool", "node": node.id, "tool": node.tool_id, "output": result.result})
+    return _response_update(node, result.result)
+
+
+async def _run_custom(state: Dict[str, Any], node: _RuntimeNode) -> Dict[str, Any]:
+    _graph_run.get().record_step({"type": "custom", "node": node.id, "state": state})
+    return {}
+
+
+# Node runners by type, picked once at compile time and bound to their node with functools.partial.
+_NODE_RUNNERS = {GraphNodeType.AGENT: _run_agent, GraphNodeType.TOOL: _run_tool}
+
+
+@lru_cache(maxsize=128)
+def _build_compiled(graph_config_json: str) -> Any:
+    """Build and compile a LangGraph workflow once per distinct graph config."""
+    graph_config = GraphConfig.model_validate_json(graph_config_json)
+    workflow = StateGraph(Annotated[Dict[str, Any], _merge_state])
+
+    for node in graph_config.nodes:
+        if node.type == GraphNodeType.START:
+            workflow.add_node(node.id, lambda state: {})
+            continue
+        if node.type == GraphNodeType.END:
+            continue
+
+        payload = node.config.get("payload", {}) if isinstance(node.config, dict) else {}
+        runtime_node = _RuntimeNode(
+            node.id,
+            node.agent_id,
+            node.tool_id,
+            _compile_tool_inputs(node.input_mapping, payload)
+            if node.type == GraphNodeType.TOOL
+            else _compile_mapping(node.input_mapping),
+            _compile_mapping(node.output_mapping),
+            _compile_agent_input(node.input_mapping),
+            {"response": None},
+        )
+
+        workflow.add_node(node.id, partial(_NODE_RUNNERS.get(node.type, _run_custom), node=runtime_node))
+
+    entry_point = graph_config.entry_point or next((n.id for n in graph_config.nodes if n.type == GraphNodeType.START), None)
+    if not entry_point:
+        raise ValueError("Graph entry point not defined")
+
+    workflow.set_entry_point(entry_point)
+
+    # One pass buckets edges by kind and source, with the END alias resolved and END targets split off.
+    conditional_by_source: Dict[str, List[Tuple[Optional[str], Any, str]]] = defaultdict(list)
+    normal_by_source: Dict[str, List[str]] = defaultdict(list)
+    ends_at: Dict[str, None] = {}
+    for edge in graph_config.edges:
+        source, target = _END_ALIAS.get(edge.source, edge.source), _END_ALIAS.get(edge.target, edge.target)
+        if edge.type == GraphEdgeType.CONDITIONAL:
+            conditional_by_source[source].append((edge.condition, edge.condition_value, target))
+        elif target is END:
+            ends_at[source] = None
+        else:
+            normal_by_source[source].append(target)
+
+    for source, routes in conditional_by_source.items():
+        workflow.add_conditional_edges(source, _compile_router(routes))
+
+    for source, targets in normal_by_source.items():
+        if len(targets) > 1:
+            # Independent targets run concurrently; nodes return partial updates, so they can share the state.
+            def dispatch(state: Dict[str, Any], fan_out: List[str] = targets) -> List[Send]:
+                return [Send(target, state) for target in fan_out]
+
+            workflow.add_conditional_edges(source, dispatch, targets)
+        else:
+            workflow.add_edge(source, targets[0])
+    for source in ends_at:
+        workflow.add_edge(source, END)
+
+    return workflow.compile()
+
+
+@lru_cache(maxsize=128)
+def _compiled_for(key: _IdentityKey) -> Any:
+    # load_graph returns the same instance until the YAML changes, so the JSON dump runs once per file version.
+    return _build_compiled(key.value.model_dump_json())
+
+
+def clear_graph_cache() -> None:
+    """Drop compiled graph workflows (e.g. on shutdown)."""
+    _compiled_for.cache_clear()
+    _build_compiled.cache_clear()
+    _adk_agent_order.cache_clear()
+    _adk_tool_func.cache_clear()
+
+
+@lru_cache(maxsize=128)
+def _adk_agent_order(key: _IdentityKey) -> Tuple[str, ...]:
+    """Walk a Google ADK flow's linear path once per config and return its agent ids in order."""
+    graph_config: GraphConfig = key.value
+    node_configs = {node.id: node for node in graph_config.nodes}
+    entry_point = graph_config.entry_point or next(
+        (n.id for n in graph_config.nodes if n.type == GraphNodeType.START),
+        None,
+    )
+    if not entry_point:
+        raise ValueError("Graph entry point not defined")
+
+    next_of: Dict[str, str] = {}
+    branching: Set[str] = set()
+    for edge in graph_config.edges:
+        if edge.type != GraphEdgeType.NORMAL:
+            continue
+        if edge.source in next_of:
+            branching.add(edge.source)
+        next_of[edge.source] = edge.target
+
+    def _next_node(node_id: str) -> Optional[str]:
+        if node_id in branching:
+            raise ValueError(f"Google ADK flow expects a linear path. Multiple edges from {node_id}.")
+        return next_of.get(node_id)
+
+    ordered: List[str] = []
+    current = _next_node(entry_point) if entry_point == "START" else entry_point
+    while current and current != "END":
+        # A linear path visits each node at most once, so a longer walk means a cycle.
+        if len(ordered) >= len(node_configs):
+            raise ValueError("Cycle detected in Google ADK flow")
+        node = node_configs.get(current)
+        if not node:
+            raise ValueError(f"Node '{current}' not found")
+        if node.type != GraphNodeType.AGENT:
+            raise ValueError("Google ADK flow supports agent nodes only")
+        if not node.agent_id:
+            raise ValueError(f"Agent node '{current}' missing agent_id")
+        ordered.append(node.agent_id)
+        current = _next_node(current)
+
+    if not ordered:
+        raise ValueError("No agent nodes found for Google ADK flow")
+    return tuple(ordered)
+
+
+class _AdkToolRun(NamedTuple):
+    llm_override: Optional[LLMOverride]
+    # LLM config of the first agent that uses each tool, keyed by tool name.
+    llm_configs: Dict[str, Any]
+
+
+# Per-flow values for the cached ADK tool functions, which are shared across requests.
+_adk_tool_run: ContextVar[_AdkToolRun] = ContextVar("adk_tool_run")
+
+
+@lru_cache(maxsize=256)
+def _adk_tool_func(tool_name: str, key: _IdentityKey) -> Callable[..., Any]:
+    """Build the ADK-callable wrapper for a tool once per file version."""
+    tool_config: ToolConfig = key.value
+
+    async def tool_func(**kwargs):
+        run = _adk_tool_run.get()
+        result = await ToolService.execute_tool(tool_name, kwargs, run.llm_override, run.llm_configs.get(tool_name))
+        if result.success:
+            return result.result
+        return {"error": result.error}
+
+    tool_func.__name__ = tool_name
+    tool_func.__doc__ = tool_config.description
+    return tool_func
+
+
+def _load_adk_flow_configs(agent_names: List[str]) -> Tuple[List[AgentConfig], Dict[str, ToolConfig]]:
+    """Load the agents of a Google ADK flow and every tool they use, keyed by tool name."""
+    agent_configs: List[AgentConfig] = []
+    for agent_name in agent_names:
+        agent_config = YAMLService.load_agent(agent_name)
+        if not agent_config:
+            raise ValueError(f"Agent '{agent_name}' not found")
+        agent_configs.append(agent_config)
+
+    tool_configs: Dict[str, ToolConfig] = {}
+    for tool_name in dict.fromkeys(name for agent_config in agent_configs for name in agent_config.tools):
+        tool_config = YAMLService.load_tool(tool_name)
+        if tool_config:
+            tool_configs[tool_name] = tool_config
+    return agent_configs, tool_configs
+
+
 class GraphService:
     logger = logging.getLogger(__name__)
 
@@ -35,14 +470,27 @@ class GraphService:
     def delete_graph(graph_id: str) -> bool:
         return YAMLService.delete_graph(graph_id)
 
+    @staticmethod
+    def warm_graphs() -> None:
+        """Compile every LangGraph-type graph so first executions skip building the workflow."""
+        for graph_id in YAMLService.list_graphs():
+            try:
+                graph_config = YAMLService.load_graph(graph_id)
+                if graph_config and graph_config.type != GraphType.GOOGLE_ADK:
+                    _compiled_for(_IdentityKey(graph_config))
+            except Exception as exc:
+                GraphService.logger.warning("Failed to pre-compile graph '%s': %s", graph_id, exc)
+
     @staticmethod
     async def execute_graph(
         graph_id: str,
         input_data: Dict[str, Any],
         context: Dict[str, Any],
         llm_override: Optional[LLMOverride] = None,
+        on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> GraphExecutionResponse:
-        start_time = time.time()
+        """Execute a graph; when ``on_step`` is given, steps are passed to it instead of returned."""
+        start_time = time.perf_counter()
         graph_config = YAMLService.load_graph(graph_id)
         if not graph_config:
             return GraphExecutionResponse(
@@ -51,144 +499,60 @@ class GraphService:
                 output={},
                 steps=[],
                 error=f"Graph '{graph_id}' not found",
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
 
         if graph_config.type == GraphType.GOOGLE_ADK:
-            return await GraphService._execute_google_adk_flow(graph_config, input_data, context, llm_override)
+            return await GraphService._execute_google_adk_flow(graph_config, input_data, context, llm_override, on_step)
 
+        output: Dict[str, Any] = {}
+        steps: List[Dict[str, Any]] = []
+        error: Optional[str] = None
         try:
-            steps: List[Dict[str, Any]] = []
-            workflow = StateGraph(dict)
-            node_configs = {node.id: node for node in graph_config.nodes}
-
-            def _get_value_from_state(path: str, state: Dict[str, Any]) -> Any:
-                if not path.startswith("$."):
-                    return state.get(path, path)
-                parts = path[2:].split(".")
-                value: Any = state
-                for part in parts:
-                    if isinstance(value, dict):
-                        value = value.get(part)
-                    else:
-                        return None
-                return value
-
-            def _apply_mapping(mapping: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
-                if not mapping:
-                    return state
-                payload: Dict[str, Any] = {}
-                for key, value in mapping.items():
-                    if isinstance(value, str):
-                        resolved = _get_value_from_state(value, state)
-                        if resolved == value and "{{" in value:
-                            rendered = value
-                            for state_key, state_value in state.items():
-                                rendered = rendered.replace(f"{{{{ {state_key} }}}}", str(state_value))
-                            payload[key] = rendered
-                        else:
-                            payload[key] = resolved
-                    else:
-                        payload[key] = value
-                return payload
-
-            for node in graph_config.nodes:
-                if node.type == GraphNodeType.START:
-                    workflow.add_node(node.id, lambda state: state)
-                    continue
-                if node.type == GraphNodeType.END:
-                    continue
-
-                async def node_runner(state: Dict[str, Any], node_id: str = node.id) -> Dict[str, Any]:
-                    node_config = node_configs[node_id]
-                    if node_config.type == GraphNodeType.AGENT:
-                        agent_name = node_config.agent_id
-                        agent_payload = _apply_mapping(node_config.input_mapping, state)
-                        agent_input = agent_payload.get("prompt") or agent_payload.get("message") or agent_payload
-                        result = await AgentService.execute_agent(agent_name, str(agent_input), context, llm_override)
-                        if not result.success:
-                            raise RuntimeError(result.error or "Agent execution failed")
-                        response_state = {"response": result.output}
-                        state.update(_apply_mapping(node_config.output_mapping, response_state))
-                        steps.append({"type": "agent", "node": node_id, "agent": agent_name, "output": result.output})
-                    elif node_config.type == GraphNodeType.TOOL:
-                        tool_name = node_config.tool_id
-                        tool_payload = _apply_mapping(node_config.input_mapping, state)
-                        payload_override = node_config.config.get("payload", {}) if isinstance(node_config.config, dict) else {}
-                        if payload_override:
-                            resolved_override = _apply_mapping(payload_override, state)
-                            tool_payload = {**resolved_override, **tool_payload}
-                        result = await ToolService.execute_tool(tool_name, tool_payload, llm_override)
-                        if not result.success:
-                            raise RuntimeError(result.error or "Tool execution failed")
-                        response_state = {"response": result.result}
-                        state.update(_apply_mapping(node_config.output_mapping, response_state))
-                        steps.append({"type": "tool", "node": node_id, "tool": tool_name, "output": result.result})
-                    else:
-                        steps.append({"type": "custom", "node": node_id, "state": state})
-                    return state
-
-                workflow.add_node(node.id, node_runner)
-
-            entry_point = graph_config.entry_point or next((n.id for n in graph_config.nodes if n.type == GraphNodeType.START), None)
-            if not entry_point:
-                raise ValueError("Graph entry point not defined")
-
-            workflow.set_entry_point(entry_point)
-
-            edges_by_source: Dict[str, List[Any]] = {}
-            for edge in graph_config.edges:
-                edges_by_source.setdefault(edge.source, []).append(edge)
-
-            for source, edges in edges_by_source.items():
-                has_conditional = any(edge.type == GraphEdgeType.CONDITIONAL for edge in edges)
-                if has_conditional:
-                    conditional_edges = [edge for edge in edges if edge.type == GraphEdgeType.CONDITIONAL]
-
-                    def route(state: Dict[str, Any], edge_set: List[Any] = conditional_edges) -> str:
-                        for edge in edge_set:
-                            if edge.condition:
-                                value = _get_value_from_state(edge.condition, state)
-                            else:
-                                value = None
-
-                            if edge.condition_value is not None:
-                                if value == edge.condition_value:
-                                    return END if edge.target == "END" else edge.target
-                            else:
-                                if value:
-                                    return END if edge.target == "END" else edge.target
-                        return END
-
-                    workflow.add_conditional_edges(source, route)
-
-                normal_edges = [edge for edge in edges if edge.type == GraphEdgeType.NORMAL]
-                for edge in normal_edges:
-                    source_node = END if edge.source == "END" else edge.source
-                    target_node = END if edge.target == "END" else edge.target
-                    workflow.add_edge(source_node, target_node)
-
-            compiled = workflow.compile()
-            final_state = await compiled.ainvoke(input_data)
-
-            return GraphExecutionResponse(
-                graph_id=graph_id,
-                success=True,
-                output=final_state or {},
-                steps=steps,
-                error=None,
-                execution_time=time.time() - start_time,
-            )
+            compiled = _compiled_for(_IdentityKey(graph_config))
+            # Nodes hand their steps to the run's sink as they finish, so the state never carries them.
+            token = _graph_run.set(_GraphRun(context, llm_override, on_step or steps.append))
+            try:
+                final_state = await compiled.ainvoke(input_data)
+            finally:
+                _graph_run.reset(token)
+
+            output = dict(final_state or {})
         except Exception as exc:
             GraphService.logger.error("Graph execution failed: %s", exc)
-            return GraphExecutionResponse(
-                graph_id=graph_id,
-                success=False,
-                output={},
-                steps=[],
-                error=str(exc),
-                execution_time=time.time() - start_time,
-            )
+            output, steps, error = {}, [], str(exc)
+
+        return GraphExecutionResponse(
+            graph_id=graph_id,
+            success=error is None,
+            output=output,
+            steps=steps,
+            error=error,
+            execution_time=time.perf_counter() - start_time,
+        )
+
+    @staticmethod
+    async def execute_graph_stream(
+        graph_id: str,
+        input_data: Dict[str, Any],
+        context: Dict[str, Any],
+        llm_override: Optional[LLMOverride] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a graph and yield step events as nodes complete, then a final result event."""
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        task = asyncio.create_task(
+            GraphService.execute_graph(graph_id, input_data, context, llm_override, on_step=queue.put_nowait)
+        )
+        task.add_done_callback(lambda _: queue.put_nowait(done))
+        try:
+            while (step := await queue.get()) is not done:
+                yield {"type": "step", "data": step}
+            result = task.result()
+        finally:
+            task.cancel()
+
+        yield {"type": "result", **result.model_dump(exclude={"steps"})}
 
     @staticmethod
     async def _execute_google_adk_flow(
@@ -196,116 +560,56 @@ class GraphService:
         input_data: Dict[str, Any],
         context: Dict[str, Any],
         llm_override: Optional[LLMOverride] = None,
+        on_step: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> GraphExecutionResponse:
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            from google.adk.agents import LlmAgent, SequentialAgent
-            from google.adk.runners import Runner
-            from google.adk.sessions import InMemorySessionService
-            from google.genai import types
-        except ImportError as exc:
+            adk = load_adk()
+        except ImportError:
             return GraphExecutionResponse(
                 graph_id=graph_config.id,
                 success=False,
                 output={},
                 steps=[],
                 error="google-adk is required for google_adk graphs. Install with 'pip install google-adk'.",
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
 
+        tool_llm_configs: Dict[str, Any] = {}
+        token = _adk_tool_run.set(_AdkToolRun(llm_override, tool_llm_configs))
         try:
-            node_configs = {node.id: node for node in graph_config.nodes}
-            entry_point = graph_config.entry_point or next(
-                (n.id for n in graph_config.nodes if n.type == GraphNodeType.START),
-                None,
+            ordered_agent_nodes = list(_adk_agent_order(_IdentityKey(graph_config)))
+
+            app_name = graph_config.metadata.get("app_name", graph_config.id)
+            user_id = graph_config.metadata.get("user_id", "local-user")
+            session_id = graph_config.metadata.get("session_id", "local-session")
+
+            # Read every agent/tool config in one worker thread while the session is created.
+            session_service = adk.InMemorySessionService()
+            (agent_configs, tool_configs), _ = await asyncio.gather(
+                asyncio.to_thread(_load_adk_flow_configs, ordered_agent_nodes),
+                session_service.create_session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    session_id=session_id,
+                ),
             )
-            if not entry_point:
-                raise ValueError("Graph entry point not defined")
-
-            edges_by_source: Dict[str, List[Any]] = {}
-            for edge in graph_config.edges:
-                if edge.type != GraphEdgeType.NORMAL:
-                    continue
-                edges_by_source.setdefault(edge.source, []).append(edge)
-
-            def _next_node(node_id: str) -> Optional[str]:
-                edges = edges_by_source.get(node_id, [])
-                if len(edges) > 1:
-                    raise ValueError(f"Google ADK flow expects a linear path. Multiple edges from {node_id}.")
-                if not edges:
-                    return None
-                return edges[0].target
-
-            ordered_agent_nodes: List[str] = []
-            visited = set()
-            current = entry_point
-            if current == "START":
-                current = _next_node(current)
-
-            while current and current != "END":
-                if current in visited:
-                    raise ValueError("Cycle detected in Google ADK flow")
-                visited.add(current)
-                node = node_configs.get(current)
-                if not node:
-                    raise ValueError(f"Node '{current}' not found")
-                if node.type != GraphNodeType.AGENT:
-                    raise ValueError("Google ADK flow supports agent nodes only")
-                if not node.agent_id:
-                    raise ValueError(f"Agent node '{current}' missing agent_id")
-                ordered_agent_nodes.append(node.agent_id)
-                current = _next_node(current)
-
-            if not ordered_agent_nodes:
-                raise ValueError("No agent nodes found for Google ADK flow")
-
-            tools_cache: Dict[str, List[Any]] = {}
-
-            def build_tools(tool_names: List[str], llm_config: Any) -> List[Any]:
-                tool_funcs: List[Any] = []
-                for tool_name in tool_names:
-                    if tool_name in tools_cache:
-                        tool_funcs.extend(tools_cache[tool_name])
-                        continue
-
-                    tool_config = YAMLService.load_tool(tool_name)
-                    if not tool_config:
-                        continue
-
-                    async def tool_func(tool_name_arg=tool_name, **kwargs):
-                        result = await ToolService.execute_tool(
-                            tool_name_arg,
-                            kwargs,
-                            llm_override,
-                            llm_config,
-                        )
-                        if result.success:
-                            return result.result
-                        return {"error": result.error}
-
-                    tool_func.__name__ = tool_name
-                    tool_func.__doc__ = tool_config.description
-                    tool_funcs.append(tool_func)
-                    tools_cache[tool_name] = [tool_func]
-
-                return tool_funcs
 
             sub_agents = []
-            for agent_name in ordered_agent_nodes:
-                agent_config = YAMLService.load_agent(agent_name)
-                if not agent_config:
-                    raise ValueError(f"Agent '{agent_name}' not found")
-
+            for agent_config in agent_configs:
                 llm_config = LLMService.resolve_llm_config(agent_config.llm_config, llm_override)
-                google_api_key = llm_config.api_key or settings.llm_api_key
-                if google_api_key:
-                    os.environ["GOOGLE_API_KEY"] = google_api_key
+                set_google_api_key(llm_config.api_key or settings.llm_api_key)
 
-                tools = build_tools(agent_config.tools, llm_config)
+                tools = []
+                for tool_name in agent_config.tools:
+                    tool_config = tool_configs.get(tool_name)
+                    if tool_config:
+                        tool_llm_configs.setdefault(tool_name, llm_config)
+                        tools.append(_adk_tool_func(tool_name, _IdentityKey(tool_config)))
 
                 sub_agents.append(
-                    LlmAgent(
+                    adk.LlmAgent(
                         name=agent_config.name,
                         model=llm_config.model,
                         instruction=agent_config.system_prompt,
@@ -319,52 +623,46 @@ class GraphService:
             if not re.match(r"^[A-Za-z_]", sanitized_name):
                 sanitized_name = f"adk_{sanitized_name}"
 
-            root_agent = SequentialAgent(
+            root_agent = adk.SequentialAgent(
                 name=sanitized_name,
                 sub_agents=sub_agents,
                 description=graph_config.description or "Google ADK flow",
             )
 
-            app_name = graph_config.metadata.get("app_name", graph_config.id)
-            user_id = graph_config.metadata.get("user_id", "local-user")
-            session_id = graph_config.metadata.get("session_id", "local-session")
-
-            session_service = InMemorySessionService()
-            await session_service.create_session(
-                app_name=app_name,
-                user_id=user_id,
-                session_id=session_id,
-            )
-
-            runner = Runner(agent=root_agent, app_name=app_name, session_service=session_service)
+            runner = adk.Runner(agent=root_agent, app_name=app_name, session_service=session_service)
 
             user_message = input_data.get("message") or input_data.get("prompt")
             if not user_message:
-                user_message = json.dumps(input_data) if input_data else "Hello"
-
-            content = types.Content(role="user", parts=[types.Part(text=str(user_message))])
-            events = runner.run_async(user_id=user_id, session_id=session_id, new_message=content)
+                user_message = orjson.dumps(input_data).decode() if input_data else "Hello"
 
+            content = adk.types.Content(role="user", parts=[adk.types.Part(text=str(user_message))])
             steps: List[Dict[str, Any]] = []
+            record_step = on_step or steps.append
+            # Flows can opt out of per-event steps; the run then ends at the last sub-agent's final response.
+            collect_steps = graph_config.metadata.get("collect_steps", True)
+            last_agent = sub_agents[-1].name
             final_output = ""
-            async for event in events:
-                step: Dict[str, Any] = {"type": "adk_event"}
-                event_type = getattr(event, "type", None)
-                if event_type is not None:
-                    step["event_type"] = event_type
-
-                content_text = None
-                if getattr(event, "content", None) is not None and getattr(event.content, "parts", None):
-                    part = event.content.parts[0]
-                    content_text = getattr(part, "text", None)
-
-                if content_text:
-                    step["content"] = content_text
-
-                steps.append(step)
-
-                if hasattr(event, "is_final_response") and event.is_final_response():
-                    final_output = content_text or ""
+            # aclosing shuts the ADK run down here on an early break instead of in a GC finalizer.
+            async with aclosing(runner.run_async(user_id=user_id, session_id=session_id, new_message=content)) as events:
+                async for event in events:
+                    content_text = None
+                    if getattr(event, "content", None) is not None and getattr(event.content, "parts", None):
+                        part = event.content.parts[0]
+                        content_text = getattr(part, "text", None)
+
+                    if collect_steps:
+                        step: Dict[str, Any] = {"type": "adk_event"}
+                        event_type = getattr(event, "type", None)
+                        if event_type is not None:
+                            step["event_type"] = event_type
+                        if content_text:
+                            step["content"] = content_text
+                        record_step(step)
+
+                    if hasattr(event, "is_final_response") and event.is_final_response():
+                        final_output = content_text or ""
+                        if not collect_steps and getattr(event, "author", None) == last_agent:
+                            break
 
             return GraphExecutionResponse(
                 graph_id=graph_config.id,
@@ -372,7 +670,7 @@ class GraphService:
                 output={"response": final_output},
                 steps=steps,
                 error=None,
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
         except Exception as exc:
             GraphService.logger.error("Google ADK flow execution failed: %s", exc)
@@ -382,6 +680,7 @@ class GraphService:
                 output={},
                 steps=[],
                 error=str(exc),
-                execution_time=time.time() - start_time,
+                execution_time=time.perf_counter() - start_time,
             )
-
+        finally:
+            _adk_tool_run.reset(token)
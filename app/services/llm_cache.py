@@ -0,0 +1,129 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Protocol
+
+import orjson
+
+from app.config import settings
+
+
+class CacheBackend(Protocol):
+    """Storage used by LLMCache; values are JSON-serializable dicts."""
+
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def set(self, key: str, value: Any) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class LRUBackend:
+    """In-process LRU backend."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class MemcachedBackend:
+    """Memcached backend shared across workers (requires aiomcache)."""
+
+    def __init__(self, host: str, port: int = 11211, ttl: int = 3600):
+        try:
+            import aiomcache
+        except ImportError as exc:
+            raise ImportError(
+                "aiomcache package is required for the memcached LLM cache. Install with 'pip install aiomcache'."
+            ) from exc
+        self.ttl = ttl
+        self._client = aiomcache.Client(host, port)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(key.encode())
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._client.set(key.encode(), orjson.dumps(value), exptime=self.ttl)
+
+    async def clear(self) -> None:
+        await self._client.flush_all()
+
+
+class LLMCache:
+    """Response cache for deterministic (temperature 0) LLM calls."""
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def cache_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        **params: Any,
+    ) -> Optional[str]:
+        """Hash a request, or return None when sampling makes it non-deterministic."""
+        if temperature is None or temperature > 0:
+            return None
+        sorted_tools = sorted(tools or [], key=lambda schema: schema.get("function", {}).get("name", ""))
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "tools": sorted_tools,
+                "temperature": float(temperature),
+                "params": params,
+            },
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.backend.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+            self.logger.debug("LLM cache hit: %s", key)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.backend.set(key, value)
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMCache]:
+    """Return the configured LLM cache, or None when caching is disabled."""
+    if not settings.llm_cache_enabled:
+        return None
+    if settings.llm_cache_memcached_host:
+        backend: CacheBackend = MemcachedBackend(
+            settings.llm_cache_memcached_host,
+            settings.llm_cache_memcached_port,
+            settings.llm_cache_ttl,
+        )
+    else:
+        backend = LRUBackend(settings.llm_cache_max_entries)
+    return LLMCache(backend)
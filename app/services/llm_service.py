@@ -1,16 +1,55 @@
-import json
+import asyncio
 import logging
 import os
 import re
-from typing import Optional, Any, Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Any, Dict, Tuple
 
 import httpx
-from langchain_openai import ChatOpenAI
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from app.models import LLMConfig, LLMOverride
 from app.config import settings
 from app.services.openai_http_logger import OpenAIHTTPLogger
 
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+_ENV_RE = re.compile(r"\$\{([^}]+)\}")
+
+# LLMOverride fields copied over the config as-is when set; env-expanded fields are handled separately.
+_OVERRIDE_FIELDS = ("temperature", "max_tokens")
+
+# Config fields passed to clients explicitly; never forwarded from additional_params.
+_RESERVED_KEYS = frozenset({"model", "api_key", "base_url", "temperature", "max_tokens", "extra_headers"})
+
+
+@lru_cache(maxsize=128)
+def _build_request_params(llm_config_json: str) -> Dict[str, Any]:
+    llm_config = LLMConfig.model_validate_json(llm_config_json)
+    return {
+        "temperature": llm_config.temperature,
+        "max_tokens": llm_config.max_tokens,
+        **{
+            key: value
+            for key, value in (llm_config.additional_params or {}).items()
+            if key not in _RESERVED_KEYS
+        },
+    }
+
+
+@lru_cache(maxsize=1)
+def _default_llm_config() -> LLMConfig:
+    return LLMConfig(
+        provider=settings.llm_provider,
+        model=settings.llm_model,
+        api_key=settings.llm_api_key,
+        base_url=settings.llm_base_url,
+        temperature=settings.llm_temperature,
+        max_tokens=settings.llm_max_tokens,
+    )
+
 
 class LLMService:
 
@@ -22,44 +61,30 @@ class LLMService:
             return None
         if "${" not in value:
             return value
-        pattern = r"\$\{([^}]+)\}"
         resolved = value
         # Support nested indirection such as ${LLM_BASE_URL} -> ${AZURE_OPENAI_BASE_URL} -> https://...
         for _ in range(3):
-            matches = re.findall(pattern, resolved)
-            if not matches:
-                break
-            updated = resolved
-            for match in matches:
-                env_value = os.getenv(match, "")
-                updated = updated.replace(f"${{{match}}}", env_value)
+            updated = _ENV_RE.sub(lambda match: os.getenv(match.group(1), ""), resolved)
             if updated == resolved:
                 break
             resolved = updated
+            if "${" not in resolved:
+                break
         return resolved
 
     @staticmethod
     def _expand_env_in_additional_params(params: Optional[dict]) -> Optional[dict]:
-        if not params:
+        if not params or not any(isinstance(value, str) and "${" in value for value in params.values()):
             return params
-        expanded: dict[str, Any] = {}
-        for key, value in params.items():
-            if isinstance(value, str):
-                expanded[key] = LLMService._expand_env_value(value)
-            else:
-                expanded[key] = value
-        return expanded
+        return {
+            key: LLMService._expand_env_value(value) if isinstance(value, str) else value
+            for key, value in params.items()
+        }
 
     @staticmethod
     def _default_config() -> LLMConfig:
-        return LLMConfig(
-            provider=settings.llm_provider,
-            model=settings.llm_model,
-            api_key=settings.llm_api_key,
-            base_url=settings.llm_base_url,
-            temperature=settings.llm_temperature,
-            max_tokens=settings.llm_max_tokens,
-        )
+        """Settings-derived config; shared, so callers must copy before changing it."""
+        return _default_llm_config()
 
     @staticmethod
     def _build_callbacks():
@@ -95,160 +120,206 @@ class LLMService:
 
         # Always expand env placeholders from YAML/base config values (e.g. ${LLM_BASE_URL})
         # before applying request-time overrides.
-        config = config.model_copy(
-            update={
-                "provider": LLMService._expand_env_value(config.provider) or config.provider,
-                "model": LLMService._expand_env_value(config.model) or config.model,
-                "api_key": LLMService._expand_env_value(config.api_key)
-                if config.api_key is not None
-                else None,
-                "base_url": LLMService._expand_env_value(config.base_url)
-                if config.base_url is not None
-                else None,
-            }
-        )
-        config.additional_params = LLMService._expand_env_in_additional_params(config.additional_params)
-
-        if not override:
-            return config
-
-        expanded_provider = LLMService._expand_env_value(override.provider)
-        expanded_model = LLMService._expand_env_value(override.model)
-        expanded_api_key = LLMService._expand_env_value(override.api_key)
-        expanded_base_url = LLMService._expand_env_value(override.base_url)
-        expanded_additional = LLMService._expand_env_in_additional_params(override.additional_params)
-
-        resolved = config.model_copy(
-            update={
-                "provider": expanded_provider or config.provider,
-                "model": expanded_model or config.model,
-                "api_key": expanded_api_key if override.api_key is not None else config.api_key,
-                "base_url": expanded_base_url if override.base_url is not None else config.base_url,
-                "temperature": override.temperature if override.temperature is not None else config.temperature,
-                "max_tokens": override.max_tokens if override.max_tokens is not None else config.max_tokens,
-            }
-        )
+        update: Dict[str, Any] = {
+            "provider": LLMService._expand_env_value(config.provider) or config.provider,
+            "model": LLMService._expand_env_value(config.model) or config.model,
+            "api_key": LLMService._expand_env_value(config.api_key)
+            if config.api_key is not None
+            else None,
+            "base_url": LLMService._expand_env_value(config.base_url)
+            if config.base_url is not None
+            else None,
+            "additional_params": LLMService._expand_env_in_additional_params(config.additional_params),
+        }
 
-        if expanded_additional is not None:
-            resolved.additional_params = {
-                **(config.additional_params or {}),
-                **expanded_additional,
-            }
+        if override:
+            expanded_additional = LLMService._expand_env_in_additional_params(override.additional_params)
+            update.update(
+                {
+                    "provider": LLMService._expand_env_value(override.provider) or update["provider"],
+                    "model": LLMService._expand_env_value(override.model) or update["model"],
+                    "api_key": LLMService._expand_env_value(override.api_key)
+                    if override.api_key is not None
+                    else update["api_key"],
+                    "base_url": LLMService._expand_env_value(override.base_url)
+                    if override.base_url is not None
+                    else update["base_url"],
+                }
+            )
+            for field in _OVERRIDE_FIELDS:
+                value = getattr(override, field)
+                if value is not None:
+                    update[field] = value
+            if expanded_additional is not None:
+                update["additional_params"] = {**(update["additional_params"] or {}), **expanded_additional}
+
+        # One copy for base expansion and overrides together.
+        return config.model_copy(update=update)
+
+    @staticmethod
+    def get_request_params(llm_config: LLMConfig) -> Dict[str, Any]:
+        """Sampling and extra request parameters for a config; shared, so callers must not mutate it."""
+        return _build_request_params(
+            llm_config.model_dump_json(include={"provider", "model", "temperature", "max_tokens", "additional_params"})
+        )
 
-        return resolved
-    
     @staticmethod
     def get_llm(llm_config: Optional[LLMConfig] = None):
-        """Get LLM instance based on configuration."""
-        LLMService.logger.debug("Initializing LLM instance")
+        """Get LLM instance based on configuration, reusing one per config and event loop."""
         if llm_config is None:
             llm_config = LLMService._default_config()
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop not in _HTTP_CLIENTS:
+            _drop_closed_loops()
+        return _build_llm(llm_config.model_dump_json(), loop)
 
-        api_key = llm_config.api_key or settings.llm_api_key
-        reserved_keys = {
-            "model",
-            "api_key",
-            "base_url",
-            "temperature",
-            "max_tokens",
-            "extra_headers",
-        }
-        extra_params = {
-            key: value
-            for key, value in (llm_config.additional_params or {}).items()
-            if key not in reserved_keys
-        }
-        request_params = {
-            "temperature": llm_config.temperature,
-            "max_tokens": llm_config.max_tokens,
-            **extra_params,
-        }
-        request_params.pop("extra_headers", None)
-
-        def _strip_extra_headers(request: httpx.Request) -> None:
-            for header in list(request.headers.keys()):
-                header_lower = header.lower()
-                if header_lower == "x-stainless-raw-response":
-                    continue
-                if header_lower.startswith("x-stainless-"):
-                    request.headers.pop(header, None)
-
-        http_client = httpx.Client(
-            verify=settings.ssl_verify,
-            event_hooks={"request": [_strip_extra_headers]},
-        )
-        http_async_client = httpx.AsyncClient(
-            verify=settings.ssl_verify,
-            event_hooks={"request": [_strip_extra_headers]},
-        )
-
-        def _build_client(client_cls, **kwargs):
-            try:
-                return client_cls(
-                    **kwargs,
-                    http_client=http_client,
-                    http_async_client=http_async_client,
-                )
-            except TypeError:
-                return client_cls(**kwargs)
-
-        if llm_config.provider.lower() != "openai":
-            raise ValueError(f"Unsupported LLM provider: {llm_config.provider}")
-
-        base_url = llm_config.base_url or settings.llm_base_url
-
-        LLMService.logger.debug(
-            "Using OpenAI provider with model: %s, base_url: %s",
-            llm_config.model,
-            base_url,
-        )
-
-        callbacks = LLMService._build_callbacks()
-
-        return _build_client(
-            ChatOpenAI,
-            model=llm_config.model,
-            api_key=api_key,
-            base_url=base_url,
-            callbacks=callbacks if callbacks else None,
-            **request_params,
-        )
-    
     @staticmethod
     def invoke(llm_config: LLMConfig, system_prompt: str, user_message: str) -> str:
         """Invoke LLM with system and user messages."""
-        LLMService.logger.debug(f"Invoking LLM: {llm_config.provider}/{llm_config.model}")
+        LLMService.logger.debug("Invoking LLM: %s/%s", llm_config.provider, llm_config.model)
         llm = LLMService.get_llm(llm_config)
         messages = [
             SystemMessage(content=system_prompt or ""),
             HumanMessage(content=user_message or "")
         ]
 
-        if settings.debug_trace:
+        trace = LLMService.logger.isEnabledFor(logging.DEBUG) and settings.debug_trace
+        if trace:
             LLMService.logger.debug(
                 "LLM request: %s",
-                json.dumps(
+                orjson.dumps(
                     {
                         "provider": llm_config.provider,
                         "model": llm_config.model,
-                        "messages": [m.model_dump() for m in messages],
+                        "messages": [{"role": m.type, "content": m.content} for m in messages],
                     },
                     default=str,
-                ),
+                ).decode(),
             )
 
         response = llm.invoke(messages)
-        LLMService.logger.debug(f"LLM response received (length: {len(response.content)} chars)")
+        LLMService.logger.debug("LLM response received (length: %d chars)", len(response.content))
 
-        if settings.debug_trace:
+        if trace:
             LLMService.logger.debug(
                 "LLM response: %s",
-                json.dumps(
+                orjson.dumps(
                     {
                         "content": response.content,
                         "additional": getattr(response, "additional_kwargs", {}),
                     },
                     default=str,
-                ),
+                ).decode(),
             )
         return response.content
+
+    @staticmethod
+    async def close_http_clients() -> None:
+        """Close the pooled connections shared by cached LLM clients."""
+        loop = asyncio.get_running_loop()
+        for client_loop, (http_client, http_async_client) in list(_HTTP_CLIENTS.items()):
+            http_client.close()
+            # Async pools can only be closed from the loop that opened them; others are dropped.
+            if client_loop is loop:
+                await http_async_client.aclose()
+        clear_llm_cache()
+
+
+# Headers the OpenAI SDK adds to every request that some OpenAI-compatible gateways reject.
+_STAINLESS_PREFIX = "x-stainless-"
+_KEEP_HEADERS = frozenset({"x-stainless-raw-response"})
+
+
+def _strip_extra_headers(request: httpx.Request) -> None:
+    headers = request.headers
+    # httpx hands out header names lower-cased, so no per-name normalization is needed.
+    for header in [name for name in headers if name.startswith(_STAINLESS_PREFIX) and name not in _KEEP_HEADERS]:
+        del headers[header]
+
+
+async def _astrip_extra_headers(request: httpx.Request) -> None:
+    """Async variant of _strip_extra_headers; httpx.AsyncClient awaits its event hooks."""
+    _strip_extra_headers(request)
+
+
+# Connection pools shared by every LLM client, keyed by the event loop the async pool belongs to.
+_HTTP_CLIENTS: Dict[Optional[asyncio.AbstractEventLoop], Tuple[httpx.Client, httpx.AsyncClient]] = {}
+
+
+def _get_http_clients(loop: Optional[asyncio.AbstractEventLoop]) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    clients = _HTTP_CLIENTS.get(loop)
+    if clients is None:
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+        )
+        clients = (
+            httpx.Client(
+                verify=settings.ssl_verify, limits=limits, event_hooks={"request": [_strip_extra_headers]}
+            ),
+            httpx.AsyncClient(
+                verify=settings.ssl_verify, limits=limits, event_hooks={"request": [_astrip_extra_headers]}
+            ),
+        )
+        _HTTP_CLIENTS[loop] = clients
+    return clients
+
+
+def _drop_closed_loops() -> None:
+    """Release the pools and LLM clients of event loops that have since closed."""
+    closed = [loop for loop in _HTTP_CLIENTS if loop is not None and loop.is_closed()]
+    if not closed:
+        return
+    for loop in closed:
+        # The async pool can no longer be closed without its loop; dropping it lets it be collected.
+        http_client, _ = _HTTP_CLIENTS.pop(loop)
+        http_client.close()
+    # lru_cache cannot evict single keys, so rebuild the (cheap) clients of the loops still open.
+    _build_llm.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _build_llm(llm_config_json: str, loop: Optional[asyncio.AbstractEventLoop]) -> "ChatOpenAI":
+    """Build a ChatOpenAI client once per config; its async pool is tied to ``loop``."""
+    # Imported on first use: langchain_openai (and the openai SDK) is the bulk of this module's import time.
+    from langchain_openai import ChatOpenAI
+
+    LLMService.logger.debug("Initializing LLM instance")
+    llm_config = LLMConfig.model_validate_json(llm_config_json)
+    if llm_config.provider.lower() != "openai":
+        raise ValueError(f"Unsupported LLM provider: {llm_config.provider}")
+
+    api_key = llm_config.api_key or settings.llm_api_key
+    base_url = llm_config.base_url or settings.llm_base_url
+    request_params = LLMService.get_request_params(llm_config)
+
+    http_client, http_async_client = _get_http_clients(loop)
+
+    LLMService.logger.debug(
+        "Using OpenAI provider with model: %s, base_url: %s",
+        llm_config.model,
+        base_url,
+    )
+
+    callbacks = LLMService._build_callbacks()
+    kwargs = dict(
+        model=llm_config.model,
+        api_key=api_key,
+        base_url=base_url,
+        callbacks=callbacks if callbacks else None,
+        **request_params,
+    )
+    try:
+        return ChatOpenAI(**kwargs, http_client=http_client, http_async_client=http_async_client)
+    except TypeError:
+        return ChatOpenAI(**kwargs)
+
+
+def clear_llm_cache() -> None:
+    """Drop cached LLM clients so their connection pools can be collected."""
+    _build_llm.cache_clear()
+    _default_llm_config.cache_clear()
+    _HTTP_CLIENTS.clear()
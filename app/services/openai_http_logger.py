@@ -1,13 +1,16 @@
 """HTTP request/response logger for OpenAI API calls."""
-import json
 import logging
 from typing import Any, Dict, Optional
+import orjson
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.outputs import LLMResult
 
 
 logger = logging.getLogger(__name__)
 
+# Optional sampling parameters copied into the logged request payload when present.
+_EXTRA_PARAM_KEYS = ("top_p", "frequency_penalty", "presence_penalty", "n", "stop")
+
 
 class OpenAIHTTPLogger(BaseCallbackHandler):
     """Callback handler to log OpenAI HTTP requests and responses."""
@@ -21,11 +24,15 @@ class OpenAIHTTPLogger(BaseCallbackHandler):
         self.enabled = enabled
         self.request_data: Optional[Dict[str, Any]] = None
     
+    def _active(self) -> bool:
+        # Checked per call: the handler lives on a cached client, so the log level may change after it is built.
+        return self.enabled and logger.isEnabledFor(logging.DEBUG)
+
     def on_llm_start(
         self, serialized: Dict[str, Any], prompts: list[str], **kwargs: Any
     ) -> None:
         """Log when LLM starts processing."""
-        if not self.enabled:
+        if not self._active():
             return
         
         # Extract invocation params which contain the HTTP request details
@@ -41,7 +48,7 @@ class OpenAIHTTPLogger(BaseCallbackHandler):
         }
         
         # Add any additional parameters
-        for key in ["top_p", "frequency_penalty", "presence_penalty", "n", "stop"]:
+        for key in _EXTRA_PARAM_KEYS:
             if key in invocation_params:
                 request_payload[key] = invocation_params[key]
         
@@ -59,12 +66,12 @@ class OpenAIHTTPLogger(BaseCallbackHandler):
         
         logger.debug(
             "OpenAI HTTP Request Payload: %s",
-            json.dumps(request_payload, indent=2, default=str)
+            orjson.dumps(request_payload, default=str).decode()
         )
     
     def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
         """Log when LLM finishes processing."""
-        if not self.enabled:
+        if not self._active():
             return
         
         # Extract response data
@@ -85,15 +92,15 @@ class OpenAIHTTPLogger(BaseCallbackHandler):
         
         logger.debug(
             "OpenAI HTTP Response Payload: %s",
-            json.dumps(response_data, indent=2, default=str)
+            orjson.dumps(response_data, default=str).decode()
         )
     
     def on_llm_error(self, error: Exception, **kwargs: Any) -> None:
         """Log when LLM encounters an error."""
-        if not self.enabled:
+        if not self._active():
             return
         
         logger.debug(
             "OpenAI HTTP Error: %s",
-            json.dumps({"error": str(error), "type": type(error).__name__}, indent=2)
+            orjson.dumps({"error": str(error), "type": type(error).__name__}).decode()
         )
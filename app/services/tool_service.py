@@ -1,18 +1,150 @@
+import asyncio
 import importlib
 import time
 import httpx
 import json
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+import orjson
+from typing import Dict, Any, List, Optional, Set, Tuple
 from app.models import ToolConfig, ToolType, ToolExecutionResponse, LLMOverride, LLMConfig
 from app.services.yaml_service import YAMLService
 from app.config import settings
 
 
+class _IdentityKey:
+    """Cache key that hashes a config by identity.
+
+    YAMLService hands out one shared instance per file version, so identity
+    changes exactly when the YAML on disk does.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __hash__(self) -> int:
+        return id(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _IdentityKey) and other.value is self.value
+
+
+@lru_cache(maxsize=512)
+def _cached_tool_schema(key: _IdentityKey) -> Dict[str, Any]:
+    tool_config = key.value
+    # Only the config currently on disk may use the persisted schema; writing it is left to persist_tool_schema.
+    if YAMLService.load_tool(tool_config.name) is tool_config:
+        schema = YAMLService.load_tool_schema(tool_config.name)
+        if schema is not None:
+            return schema
+    return ToolService.build_tool_schema(tool_config)
+
+
+@lru_cache(maxsize=256)
+def _cached_tool_schemas(keys: Tuple[_IdentityKey, ...]) -> List[Dict[str, Any]]:
+    # Round-trip through sorted-key JSON so the tools block is byte-identical on every request.
+    return [
+        orjson.loads(orjson.dumps(_cached_tool_schema(key), option=orjson.OPT_SORT_KEYS))
+        for key in keys
+    ]
+
+
 class ToolService:
 
     logger = logging.getLogger(__name__)
+
+    # One pooled client per event loop: an AsyncClient's connections belong to the loop that opened them.
+    _http_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def get_http_client() -> httpx.AsyncClient:
+        """Return the shared connection-pooled client for API tools on the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = ToolService._http_clients.get(loop)
+        if client is None or client.is_closed:
+            # Clients of closed loops can no longer be closed; drop them so they don't pile up.
+            for client_loop in [client_loop for client_loop in ToolService._http_clients if client_loop.is_closed()]:
+                del ToolService._http_clients[client_loop]
+            client = httpx.AsyncClient(
+                verify=settings.ssl_verify,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive,
+                ),
+                timeout=30.0,
+            )
+            ToolService._http_clients[loop] = client
+        return client
+
+    @staticmethod
+    async def close_http_client() -> None:
+        """Close the shared API tool clients and their pooled connections."""
+        loop = asyncio.get_running_loop()
+        clients, ToolService._http_clients = ToolService._http_clients, {}
+        for client_loop, client in clients.items():
+            # Async pools can only be closed from the loop that opened them; others are dropped.
+            if client_loop is loop:
+                await client.aclose()
     
+    @staticmethod
+    async def execute_tool_calls(
+        tool_calls: List[Tuple[str, Dict[str, Any]]],
+        strategy: str = "parallel",
+        llm_override: Optional[LLMOverride] = None,
+        llm_config: Optional[LLMConfig] = None,
+    ) -> List[ToolExecutionResponse]:
+        """Execute one LLM turn's ``(tool_name, parameters)`` calls and return results in call order.
+
+        ``sequential`` runs calls one at a time and ``parallel`` runs them all at once.
+        ``dependency`` runs them in levels, so a call waits for any call in the same turn
+        whose tool appears in its tool's ``depends_on``.
+        """
+
+        async def run(index: int) -> ToolExecutionResponse:
+            tool_name, parameters = tool_calls[index]
+            return await ToolService.execute_tool(tool_name, parameters, llm_override, llm_config)
+
+        if strategy == "sequential":
+            return [await run(index) for index in range(len(tool_calls))]
+        if strategy == "parallel":
+            return list(await asyncio.gather(*(run(index) for index in range(len(tool_calls)))))
+
+        results: List[Optional[ToolExecutionResponse]] = [None] * len(tool_calls)
+        for level in ToolService._dependency_levels([tool_name for tool_name, _ in tool_calls]):
+            async with asyncio.TaskGroup() as group:
+                tasks = {index: group.create_task(run(index)) for index in level}
+            for index, task in tasks.items():
+                results[index] = task.result()
+        return results
+
+    @staticmethod
+    def _dependency_levels(tool_names: List[str]) -> List[List[int]]:
+        """Group call indexes into levels whose dependencies are all in earlier levels."""
+        depends_on: List[Set[int]] = []
+        for index, tool_name in enumerate(tool_names):
+            tool_config = YAMLService.load_tool(tool_name)
+            wanted = set(tool_config.depends_on) if tool_config else set()
+            depends_on.append({other for other, name in enumerate(tool_names) if other != index and name in wanted})
+
+        levels: List[List[int]] = []
+        done: Set[int] = set()
+        remaining = list(range(len(tool_names)))
+        while remaining:
+            level = [index for index in remaining if depends_on[index] <= done]
+            if not level:
+                ToolService.logger.warning(
+                    "Cyclic tool dependencies among %s; running them in call order",
+                    [tool_names[index] for index in remaining],
+                )
+                levels.extend([index] for index in remaining)
+                break
+            levels.append(level)
+            done.update(level)
+            remaining = [index for index in remaining if index not in done]
+        return levels
+
     @staticmethod
     async def execute_tool(
         tool_name: str,
@@ -21,16 +153,16 @@ class ToolService:
         llm_config: Optional[LLMConfig] = None,
     ) -> ToolExecutionResponse:
         """Execute a tool by name with given parameters."""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         normalized_parameters = dict(parameters)
         nested_kwargs = normalized_parameters.pop("kwargs", None)
         if isinstance(nested_kwargs, dict):
             normalized_parameters = {**nested_kwargs, **normalized_parameters}
         
-        ToolService.logger.debug(f"Executing tool: {tool_name}")
+        ToolService.logger.debug("Executing tool: %s", tool_name)
 
-        if settings.debug_trace:
+        if settings.debug_trace and ToolService.logger.isEnabledFor(logging.DEBUG):
             ToolService.logger.debug(
                 "Tool request: %s",
                 json.dumps({"tool_name": tool_name, "parameters": normalized_parameters}, default=str)
@@ -38,17 +170,17 @@ class ToolService:
         
         tool_config = YAMLService.load_tool(tool_name)
         if not tool_config:
-            ToolService.logger.warning(f"Tool not found: {tool_name}")
+            ToolService.logger.warning("Tool not found: %s", tool_name)
             return ToolExecutionResponse(
                 tool_name=tool_name,
                 success=False,
                 result=None,
                 error=f"Tool '{tool_name}' not found",
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
         
         try:
-            ToolService.logger.debug(f"Tool type: {tool_config.type}")
+            ToolService.logger.debug("Tool type: %s", tool_config.type)
             if tool_config.type == ToolType.FUNCTION:
                 result = await ToolService._execute_function_tool(
                     tool_config,
@@ -68,10 +200,10 @@ class ToolService:
             else:
                 raise ValueError(f"Unsupported tool type: {tool_config.type}")
             
-            execution_time = time.time() - start_time
-            ToolService.logger.debug(f"Tool executed successfully: {tool_name} (took {execution_time:.3f}s)")
+            execution_time = time.perf_counter() - start_time
+            ToolService.logger.debug("Tool executed successfully: %s (took %.3fs)", tool_name, execution_time)
             
-            if settings.debug_trace:
+            if settings.debug_trace and ToolService.logger.isEnabledFor(logging.DEBUG):
                 ToolService.logger.debug(
                     "Tool response: %s",
                     json.dumps(
@@ -89,11 +221,11 @@ class ToolService:
                 success=True,
                 result=result,
                 error=None,
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
         except Exception as e:
-            ToolService.logger.error(f"Tool execution failed: {tool_name} - {str(e)}")
-            if settings.debug_trace:
+            ToolService.logger.error("Tool execution failed: %s - %s", tool_name, e)
+            if settings.debug_trace and ToolService.logger.isEnabledFor(logging.DEBUG):
                 ToolService.logger.debug(
                     "Tool error: %s",
                     json.dumps({"tool_name": tool_name, "error": str(e)}, default=str)
@@ -103,7 +235,7 @@ class ToolService:
                 success=False,
                 result=None,
                 error=str(e),
-                execution_time=time.time() - start_time
+                execution_time=time.perf_counter() - start_time
             )
     
     @staticmethod
@@ -136,7 +268,8 @@ class ToolService:
         if inspect.iscoroutinefunction(func):
             return await func(**enriched_params)
         else:
-            return func(**enriched_params)
+            # Sync tools may do blocking I/O (e.g. LLM calls); keep them off the event loop.
+            return await asyncio.to_thread(func, **enriched_params)
     
     @staticmethod
     async def _execute_api_tool(tool_config: ToolConfig, parameters: Dict[str, Any]) -> Any:
@@ -147,44 +280,44 @@ class ToolService:
         method = (tool_config.api_method or "GET").upper()
         headers = tool_config.api_headers or {}
         
-        async with httpx.AsyncClient(verify=settings.ssl_verify) as client:
-            if method == "GET":
-                response = await client.get(
-                    tool_config.api_endpoint,
-                    params=parameters,
-                    headers=headers,
-                    timeout=30.0
-                )
-            elif method == "POST":
-                response = await client.post(
-                    tool_config.api_endpoint,
-                    json=parameters,
-                    headers=headers,
-                    timeout=30.0
-                )
-            elif method == "PUT":
-                response = await client.put(
-                    tool_config.api_endpoint,
-                    json=parameters,
-                    headers=headers,
-                    timeout=30.0
-                )
-            elif method == "DELETE":
-                response = await client.delete(
-                    tool_config.api_endpoint,
-                    params=parameters,
-                    headers=headers,
-                    timeout=30.0
-                )
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            response.raise_for_status()
-            
-            if response.headers.get("content-type", "").startswith("application/json"):
-                return response.json()
-            else:
-                return response.text
+        client = ToolService.get_http_client()
+        if method == "GET":
+            response = await client.get(
+                tool_config.api_endpoint,
+                params=parameters,
+                headers=headers,
+                timeout=30.0
+            )
+        elif method == "POST":
+            response = await client.post(
+                tool_config.api_endpoint,
+                json=parameters,
+                headers=headers,
+                timeout=30.0
+            )
+        elif method == "PUT":
+            response = await client.put(
+                tool_config.api_endpoint,
+                json=parameters,
+                headers=headers,
+                timeout=30.0
+            )
+        elif method == "DELETE":
+            response = await client.delete(
+                tool_config.api_endpoint,
+                params=parameters,
+                headers=headers,
+                timeout=30.0
+            )
+        else:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        response.raise_for_status()
+        
+        if response.headers.get("content-type", "").startswith("application/json"):
+            return response.json()
+        else:
+            return response.text
     
     @staticmethod
     async def _execute_python_tool(
@@ -215,8 +348,53 @@ class ToolService:
         else:
             raise ValueError("Python tool must set 'result' variable")
     
+    @staticmethod
+    def warm_schemas() -> None:
+        """Build (or load the persisted) schema for every tool so agent setup hits the cache.
+
+        Missing or stale schema files are written here, off the request path.
+        """
+        for tool_name in YAMLService.list_tools():
+            try:
+                tool_config = YAMLService.load_tool(tool_name)
+            except Exception as exc:
+                ToolService.logger.warning("Failed to pre-load tool '%s': %s", tool_name, exc)
+                continue
+            if not tool_config:
+                continue
+            if YAMLService.load_tool_schema(tool_name) is None:
+                ToolService.persist_tool_schema(tool_config)
+            else:
+                ToolService.get_tool_schema(tool_config)
+
+    @staticmethod
+    def persist_tool_schema(tool_config: ToolConfig) -> None:
+        """Write a tool's schema next to its YAML so other workers can load it instead of building it."""
+        try:
+            YAMLService.save_tool_schema(tool_config.name, ToolService.get_tool_schema(tool_config))
+        except OSError as exc:
+            ToolService.logger.warning("Could not persist schema for tool %s: %s", tool_config.name, exc)
+
     @staticmethod
     def get_tool_schema(tool_config: ToolConfig) -> Dict[str, Any]:
+        """Get the OpenAI function calling schema for a tool config.
+
+        The schema is built once per config instance and shared; callers must not mutate it.
+        """
+        return _cached_tool_schema(_IdentityKey(tool_config))
+
+    @staticmethod
+    def get_tool_schemas(tool_names: List[str]) -> List[Dict[str, Any]]:
+        """Get the schemas for an agent's tools, skipping unknown names.
+
+        The list is shared per tool set so the request prefix stays stable for provider
+        prompt caching; callers must not mutate it.
+        """
+        tool_configs = YAMLService.load_tools(tool_names)
+        return _cached_tool_schemas(tuple(_IdentityKey(tool_config) for tool_config in tool_configs))
+
+    @staticmethod
+    def build_tool_schema(tool_config: ToolConfig) -> Dict[str, Any]:
         """Convert tool config to OpenAI function calling schema."""
         properties = {}
         required = []
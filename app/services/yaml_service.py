@@ -1,13 +1,52 @@
 import yaml
+import logging
 import os
-from typing import Dict, List, Optional
+import orjson
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Type
 from pathlib import Path
 import re
+from pydantic import BaseModel
 from app.config import settings
 from app.models import ToolConfig, AgentConfig, GraphConfig
 
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader, SafeDumper
+
+
+@lru_cache(maxsize=512)
+def _load_model_cached(path: str, mtime_ns: int, model_cls: Type[BaseModel]) -> BaseModel:
+    """Parse a YAML config into a model; keyed on mtime so edits invalidate the entry."""
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    resolved_data = YAMLService.resolve_env_vars(data)
+    return model_cls(**resolved_data)
+
+
+def _iter_yaml_stems(directory: str) -> Iterator[str]:
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".yaml") and entry.is_file():
+                    yield entry.name[:-len(".yaml")]
+    except FileNotFoundError:
+        return
+
+
+def _load_model(path: Path, model_cls: Type[BaseModel]) -> Optional[BaseModel]:
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_model_cached(str(path), mtime_ns, model_cls)
+
 
 class YAMLService:
+
+    logger = logging.getLogger(__name__)
     
     @staticmethod
     def resolve_env_vars(data: Dict) -> Dict:
@@ -39,21 +78,25 @@ class YAMLService:
     def load_tool(tool_name: str) -> Optional[ToolConfig]:
         """Load a tool configuration from YAML file."""
         tool_path = Path(settings.tools_dir) / f"{tool_name}.yaml"
-        if not tool_path.exists():
-            return None
-        
-        with open(tool_path, 'r') as f:
-            data = yaml.safe_load(f)
-        
-        resolved_data = YAMLService.resolve_env_vars(data)
-        return ToolConfig(**resolved_data)
+        return _load_model(tool_path, ToolConfig)
+    
+    @staticmethod
+    def load_tools(tool_names: List[str]) -> List[ToolConfig]:
+        """Load several tool configurations, skipping names with no YAML file."""
+        tools = []
+        for tool_name in tool_names:
+            tool_config = YAMLService.load_tool(tool_name)
+            if tool_config:
+                tools.append(tool_config)
+        return tools
     
     @staticmethod
     def save_tool(tool: ToolConfig) -> None:
         """Save a tool configuration to YAML file."""
         tool_path = Path(settings.tools_dir) / f"{tool.name}.yaml"
         with open(tool_path, 'w') as f:
-            yaml.dump(tool.model_dump(exclude_none=True), f, default_flow_style=False)
+            yaml.dump(tool.model_dump(mode="json", exclude_none=True), f, Dumper=SafeDumper, default_flow_style=False)
+        _load_model_cached.cache_clear()
     
     @staticmethod
     def delete_tool(tool_name: str) -> bool:
@@ -61,8 +104,28 @@ class YAMLService:
         tool_path = Path(settings.tools_dir) / f"{tool_name}.yaml"
         if tool_path.exists():
             tool_path.unlink()
+            (Path(settings.tools_dir) / f"{tool_name}.schema.json").unlink(missing_ok=True)
+            _load_model_cached.cache_clear()
             return True
         return False
+
+    @staticmethod
+    def load_tool_schema(tool_name: str) -> Optional[Dict[str, Any]]:
+        """Load a tool's precomputed function schema, if it is at least as new as the tool YAML."""
+        tool_path = Path(settings.tools_dir) / f"{tool_name}.yaml"
+        schema_path = Path(settings.tools_dir) / f"{tool_name}.schema.json"
+        try:
+            if os.stat(schema_path).st_mtime_ns < os.stat(tool_path).st_mtime_ns:
+                return None
+            return orjson.loads(schema_path.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def save_tool_schema(tool_name: str, schema: Dict[str, Any]) -> None:
+        """Persist a tool's function schema next to its YAML."""
+        schema_path = Path(settings.tools_dir) / f"{tool_name}.schema.json"
+        schema_path.write_bytes(orjson.dumps(schema))
     
     @staticmethod
     def list_tools() -> List[str]:
@@ -71,26 +134,30 @@ class YAMLService:
         if not tools_path.exists():
             return []
         return [f.stem for f in tools_path.glob("*.yaml")]
+
+    @staticmethod
+    def iter_tools() -> Iterator[str]:
+        """Lazily yield tool names as the directory is scanned."""
+        return _iter_yaml_stems(settings.tools_dir)
+
+    @staticmethod
+    def known_tool_names() -> Set[str]:
+        """Return the set of tool names with a config on disk, without parsing any YAML."""
+        return set(YAMLService.list_tools())
     
     @staticmethod
     def load_agent(agent_name: str) -> Optional[AgentConfig]:
         """Load an agent configuration from YAML file."""
         agent_path = Path(settings.agents_dir) / f"{agent_name}.yaml"
-        if not agent_path.exists():
-            return None
-        
-        with open(agent_path, 'r') as f:
-            data = yaml.safe_load(f)
-        
-        resolved_data = YAMLService.resolve_env_vars(data)
-        return AgentConfig(**resolved_data)
+        return _load_model(agent_path, AgentConfig)
     
     @staticmethod
     def save_agent(agent: AgentConfig) -> None:
         """Save an agent configuration to YAML file."""
         agent_path = Path(settings.agents_dir) / f"{agent.name}.yaml"
         with open(agent_path, 'w') as f:
-            yaml.dump(agent.model_dump(exclude_none=True), f, default_flow_style=False)
+            yaml.dump(agent.model_dump(mode="json", exclude_none=True), f, Dumper=SafeDumper, default_flow_style=False)
+        _load_model_cached.cache_clear()
     
     @staticmethod
     def delete_agent(agent_name: str) -> bool:
@@ -98,6 +165,7 @@ class YAMLService:
         agent_path = Path(settings.agents_dir) / f"{agent_name}.yaml"
         if agent_path.exists():
             agent_path.unlink()
+            _load_model_cached.cache_clear()
             return True
         return False
     
@@ -109,25 +177,23 @@ class YAMLService:
             return []
         return [f.stem for f in agents_path.glob("*.yaml")]
 
+    @staticmethod
+    def iter_agents() -> Iterator[str]:
+        """Lazily yield agent names as the directory is scanned."""
+        return _iter_yaml_stems(settings.agents_dir)
+
     @staticmethod
     def load_graph(graph_id: str) -> Optional[GraphConfig]:
         """Load a graph configuration from YAML file."""
-        graph_path = Path(settings.graphs_dir) / f"{graph_id}.yaml"
-        if not graph_path.exists():
-            return None
-
-        with open(graph_path, "r") as f:
-            data = yaml.safe_load(f)
-
-        resolved_data = YAMLService.resolve_env_vars(data)
-        return GraphConfig(**resolved_data)
+        return _load_model(Path(settings.graphs_dir) / f"{graph_id}.yaml", GraphConfig)
 
     @staticmethod
     def save_graph(graph: GraphConfig) -> None:
         """Save a graph configuration to YAML file."""
         graph_path = Path(settings.graphs_dir) / f"{graph.id}.yaml"
         with open(graph_path, "w") as f:
-            yaml.dump(graph.model_dump(exclude_none=True), f, default_flow_style=False)
+            yaml.dump(graph.model_dump(mode="json", exclude_none=True), f, Dumper=SafeDumper, default_flow_style=False)
+        _load_model_cached.cache_clear()
 
     @staticmethod
     def delete_graph(graph_id: str) -> bool:
@@ -135,6 +201,7 @@ class YAMLService:
         graph_path = Path(settings.graphs_dir) / f"{graph_id}.yaml"
         if graph_path.exists():
             graph_path.unlink()
+            _load_model_cached.cache_clear()
             return True
         return False
 
@@ -145,3 +212,17 @@ class YAMLService:
         if not graphs_path.exists():
             return []
         return [f.stem for f in graphs_path.glob("*.yaml")]
+
+    @staticmethod
+    def warm_cache() -> None:
+        """Parse every tool, agent and graph config once so first requests hit the cache."""
+        for loader, names in (
+            (YAMLService.load_tool, YAMLService.list_tools()),
+            (YAMLService.load_agent, YAMLService.list_agents()),
+            (YAMLService.load_graph, YAMLService.list_graphs()),
+        ):
+            for name in names:
+                try:
+                    loader(name)
+                except Exception as exc:
+                    YAMLService.logger.warning("Failed to pre-load config '%s': %s", name, exc)
@@ -0,0 +1,36 @@
+import pytest
+
+from app.config import settings
+
+TOOL_YAML = """name: {name}
+description: {description}
+type: python
+python_code: {python_code}
+depends_on: {depends_on}
+"""
+
+
+@pytest.fixture
+def tools_dir(tmp_path, monkeypatch):
+    """Point settings.tools_dir at a temporary directory."""
+    monkeypatch.setattr(settings, "tools_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def write_tool(tools_dir):
+    """Return a helper that writes a python tool YAML into tools_dir."""
+
+    def write(name, description=None, python_code=None, depends_on=()):
+        path = tools_dir / f"{name}.yaml"
+        path.write_text(
+            TOOL_YAML.format(
+                name=name,
+                description=description or f"{name} tool",
+                python_code=python_code or f"result = '{name}'",
+                depends_on=list(depends_on),
+            )
+        )
+        return path
+
+    return write
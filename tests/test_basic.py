@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
@@ -62,3 +63,87 @@ def test_get_tool_schema():
     schema = response.json()
     assert "type" in schema
     assert schema["type"] == "function"
+
+
+def test_execute_agent_stream_not_found():
+    """Test streaming an unknown agent emits a failed result event."""
+    response = client.post(
+        "/execute/agent/stream",
+        json={"agent_name": "does_not_exist", "input": "hi"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line for line in response.text.splitlines() if line.startswith("data: ")]
+    assert len(events) == 1
+    assert '"type":"result"' in events[0]
+    assert '"success":false' in events[0]
+
+
+def test_execute_agent_batch_not_found():
+    """Test batch execution returns one response per input in order."""
+    response = client.post(
+        "/execute/agent/batch",
+        json={"agent_name": "does_not_exist", "inputs": ["a", "b", "c"], "concurrency": 2}
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert len(results) == 3
+    assert all(not result["success"] for result in results)
+
+
+def test_create_agent_with_missing_tools():
+    """Test creating an agent that references unknown tools."""
+    response = client.post(
+        "/admin/agents",
+        json={
+            "name": "missing_tools_agent",
+            "description": "Agent with unknown tools",
+            "llm_config": {"provider": "openai", "model": "gpt-4"},
+            "system_prompt": "You are helpful.",
+            "tools": ["calculator", "no_such_tool"]
+        }
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Tools not found: no_such_tool"
+
+
+def test_no_duplicate_routes():
+    """Test no two handlers are registered for the same method and path."""
+    seen = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (method, route.path)
+            assert key not in seen, f"Duplicate route: {method} {route.path}"
+            seen.add(key)
+
+
+def test_stream_tools_matches_list():
+    """Test the streamed tool list matches the regular listing."""
+    streamed = client.get("/admin/tools", params={"stream": "true"})
+    assert streamed.status_code == 200
+    assert sorted(streamed.json()) == sorted(client.get("/admin/tools").json())
+    # "stream" is an ordinary tool name, not a reserved listing path.
+    assert client.get("/admin/tools/stream").status_code == 404
+
+
+def test_get_tool():
+    """Test getting a tool configuration."""
+    response = client.get("/admin/tools/calculator")
+    assert response.status_code == 200
+    tool = response.json()
+    assert tool["name"] == "calculator"
+    assert tool["type"] == "function"
+
+
+def test_execute_graph_stream_ndjson():
+    """Test graph streaming emits NDJSON when requested."""
+    response = client.post(
+        "/execute/graph/stream",
+        json={"graph_id": "tool-payload-demo", "input": {}},
+        headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    assert events[-1]["type"] == "result"
+    assert all(event["type"] == "step" for event in events[:-1])
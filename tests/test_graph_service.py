@@ -0,0 +1,302 @@
+import asyncio
+
+import pytest
+from langgraph.graph import END
+
+from app.config import settings
+from app.models import AgentExecutionResponse, ToolExecutionResponse
+from app.services import graph_service
+from app.services.graph_service import (
+    GraphService,
+    _compile_agent_input,
+    _compile_mapping,
+    _compile_path,
+    _compile_router,
+    _compile_tool_inputs,
+)
+from app.services.agent_service import AgentService
+from app.services.tool_service import ToolService, _IdentityKey
+from app.services.yaml_service import YAMLService
+
+
+def test_compiled_mapping_resolves_values():
+    """Test literals, plain keys, paths and templates resolve against state."""
+    mapping = _compile_mapping(
+        {
+            "limit": 5,
+            "query": "question",
+            "city": "$.location.city",
+            "missing": "$.location.zip",
+            "prompt": "Weather in {{ question }}",
+        }
+    )
+    state = {"question": "Paris?", "location": {"city": "Paris"}}
+    assert mapping(state) == {
+        "limit": 5,
+        "query": "Paris?",
+        "city": "Paris",
+        "missing": None,
+        "prompt": "Weather in Paris?",
+    }
+
+
+def test_empty_mapping_passes_state_through():
+    """Test an empty mapping returns the state unchanged."""
+    state = {"response": "ok"}
+    assert _compile_mapping({})(state) is state
+
+
+def test_template_keeps_unknown_placeholders():
+    """Test placeholders without a matching state key are left as written."""
+    mapping = _compile_mapping({"text": "{{question}} / {{ other }}"})
+    assert mapping({"question": "why"}) == {"text": "why / {{ other }}"}
+
+
+GRAPH_YAML = """id: fan-out
+name: Fan out
+entry_point: START
+nodes:
+  - {id: START, name: Start, type: start}
+  - {id: left, name: Left, type: tool, tool_id: left, output_mapping: {left: $.response}}
+  - {id: right, name: Right, type: tool, tool_id: right, output_mapping: {right: $.response}}
+  - {id: END, name: End, type: end}
+edges:
+  - {id: e1, source: START, target: left, type: normal}
+  - {id: e2, source: START, target: right, type: normal}
+  - {id: e3, source: left, target: END, type: normal}
+  - {id: e4, source: right, target: END, type: normal}
+"""
+
+
+@pytest.mark.asyncio
+async def test_fan_out_targets_merge_into_state(tools_dir, write_tool, monkeypatch):
+    """Test nodes sharing a source all run and their outputs are merged."""
+    monkeypatch.setattr(settings, "graphs_dir", str(tools_dir))
+    for name in ("left", "right"):
+        write_tool(name)
+    (tools_dir / "fan-out.yaml").write_text(GRAPH_YAML)
+
+    result = await GraphService.execute_graph("fan-out", {"query": "q"}, {})
+    assert result.success, result.error
+    assert result.output == {"query": "q", "left": "left", "right": "right"}
+    assert sorted(step["node"] for step in result.steps) == ["left", "right"]
+
+
+def test_conditional_router_matches_edge_order():
+    """Test the table-based router picks the same target as checking edges in order."""
+    route = _compile_router([("$.status", "ok", "done"), ("$.status", "retry", "again"), ("$.status", None, "other")])
+    assert route({"status": "ok"}) == "done"
+    assert route({"status": "retry"}) == "again"
+    assert route({"status": "unknown"}) == "other"
+    assert route({"status": ["unhashable"]}) == "other"
+    assert route({}) == END
+
+    mixed = _compile_router([("$.flag", None, "flagged"), ("$.status", "ok", "done")])
+    assert mixed({"flag": True, "status": "ok"}) == "flagged"
+    assert mixed({"status": "ok"}) == "done"
+
+
+def test_agent_input_accessor_follows_mapping_keys():
+    """Test the compiled agent input matches the prompt/message/payload fallback chain."""
+    assert _compile_agent_input({"prompt": "$.q"})({"prompt": "hi"}) == "hi"
+    assert _compile_agent_input({"message": "$.q"})({"message": ""}) == {"message": ""}
+    assert _compile_agent_input({"query": "$.q"})({"query": "hi"}) == {"query": "hi"}
+    assert _compile_agent_input({})({"prompt": None, "message": "hello"}) == "hello"
+
+
+def test_state_paths_of_any_depth():
+    """Test shallow, nested and deep paths resolve, returning None through non-dict values."""
+    state = {"a": {"b": {"c": 1}}, "flat": 2}
+    assert _compile_path("$.flat")(state) == 2
+    assert _compile_path("$.a.b")(state) == {"c": 1}
+    assert _compile_path("$.flat.b")(state) is None
+    assert _compile_path("$.a.b.c")(state) == 1
+    assert _compile_path("$.flat.b.c")(state) is None
+    assert _compile_path("plain")(state) == "plain"
+
+
+def test_tool_inputs_fuse_payload_defaults():
+    """Test tool payload defaults are merged under the mapped inputs."""
+    fused = _compile_tool_inputs({"expression": "$.expr"}, {"expression": "1+1", "precision": 2})
+    assert fused({"expr": "2*3"}) == {"expression": "2*3", "precision": 2}
+
+    state_inputs = _compile_tool_inputs({}, {"precision": 2})
+    assert state_inputs({"expr": "2*3", "precision": 4}) == {"expr": "2*3", "precision": 4}
+
+
+@pytest.mark.asyncio
+async def test_fan_out_targets_run_concurrently(tmp_path, monkeypatch):
+    """Test sibling branches are awaited together rather than one after another."""
+    monkeypatch.setattr(settings, "graphs_dir", str(tmp_path))
+    (tmp_path / "fan-out.yaml").write_text(GRAPH_YAML)
+    in_flight, peak = 0, 0
+
+    async def fake_execute_tool(tool_name, parameters, llm_override=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ToolExecutionResponse(tool_name=tool_name, success=True, result=tool_name, execution_time=0.01)
+
+    monkeypatch.setattr(ToolService, "execute_tool", staticmethod(fake_execute_tool))
+    result = await GraphService.execute_graph("fan-out", {}, {})
+    assert result.success, result.error
+    assert peak == 2
+
+
+def test_constant_mapping_returns_fresh_copies():
+    """Test literal-only mappings resolve to a new dict on every call."""
+    mapping = _compile_mapping({"limit": 5, "strict": True})
+    first = mapping({"ignored": 1})
+    assert first == {"limit": 5, "strict": True}
+    first["limit"] = 10
+    assert mapping({}) == {"limit": 5, "strict": True}
+
+
+CHAIN_YAML = """id: chain
+name: Chain
+entry_point: START
+nodes:
+  - {id: START, name: Start, type: start}
+  - {id: a, name: A, type: tool, tool_id: a, output_mapping: {a: $.response}}
+  - {id: b, name: B, type: tool, tool_id: b, output_mapping: {b: $.response}}
+  - {id: c, name: C, type: agent, agent_id: c}
+  - {id: END, name: End, type: end}
+edges:
+  - {id: e1, source: START, target: a, type: normal}
+  - {id: e2, source: a, target: b, type: normal}
+  - {id: e3, source: b, target: c, type: normal}
+  - {id: e4, source: c, target: END, type: normal}
+"""
+
+
+@pytest.mark.asyncio
+async def test_unmapped_nodes_do_not_receive_step_history(tmp_path, monkeypatch):
+    """Test nodes without an input mapping get the user state but not the internal step list."""
+    monkeypatch.setattr(settings, "graphs_dir", str(tmp_path))
+    (tmp_path / "chain.yaml").write_text(CHAIN_YAML)
+    tool_inputs, agent_inputs = {}, []
+
+    async def fake_execute_tool(tool_name, parameters, llm_override=None):
+        tool_inputs[tool_name] = dict(parameters)
+        return ToolExecutionResponse(tool_name=tool_name, success=True, result=tool_name, execution_time=0.0)
+
+    async def fake_execute_agent(agent_name, user_input, context=None, llm_override=None):
+        agent_inputs.append(user_input)
+        return AgentExecutionResponse(agent_name=agent_name, success=True, output="done", steps=[], execution_time=0.0)
+
+    monkeypatch.setattr(ToolService, "execute_tool", staticmethod(fake_execute_tool))
+    monkeypatch.setattr(AgentService, "execute_agent", staticmethod(fake_execute_agent))
+    result = await GraphService.execute_graph("chain", {"query": "q"}, {})
+    assert result.success, result.error
+    assert tool_inputs["b"] == {"query": "q", "a": "a"}
+    assert agent_inputs == [str({"query": "q", "a": "a", "b": "b"})]
+    assert [step["node"] for step in result.steps] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_steps_stream_through_the_run_sink_not_graph_state(tmp_path, monkeypatch):
+    """Test steps reach the caller as nodes finish while the graph state only holds user keys."""
+    monkeypatch.setattr(settings, "graphs_dir", str(tmp_path))
+    (tmp_path / "chain.yaml").write_text(CHAIN_YAML)
+
+    async def fake_execute_tool(tool_name, parameters, llm_override=None):
+        return ToolExecutionResponse(tool_name=tool_name, success=True, result=tool_name, execution_time=0.0)
+
+    async def fake_execute_agent(agent_name, user_input, context=None, llm_override=None):
+        return AgentExecutionResponse(agent_name=agent_name, success=True, output="done", steps=[], execution_time=0.0)
+
+    monkeypatch.setattr(ToolService, "execute_tool", staticmethod(fake_execute_tool))
+    monkeypatch.setattr(AgentService, "execute_agent", staticmethod(fake_execute_agent))
+    events = [event async for event in GraphService.execute_graph_stream("chain", {"query": "q"}, {})]
+    assert [event["data"]["node"] for event in events[:-1]] == ["a", "b", "c"]
+    assert events[-1]["output"] == {"query": "q", "a": "a", "b": "b", "response": "done"}
+
+    steps = []
+    compiled = graph_service._compiled_for(_IdentityKey(YAMLService.load_graph("chain")))
+    token = graph_service._graph_run.set(graph_service._GraphRun({}, None, steps.append))
+    try:
+        final_state = await compiled.ainvoke({"query": "q"})
+    finally:
+        graph_service._graph_run.reset(token)
+    assert final_state == {"query": "q", "a": "a", "b": "b", "response": "done"}
+    assert [step["node"] for step in steps] == ["a", "b", "c"]
+
+
+ADK_FLOW_YAML = """id: adk-flow
+name: ADK flow
+type: google_adk
+entry_point: START
+nodes:
+  - {id: START, name: Start, type: start}
+  - {id: writer, name: Writer, type: agent, agent_id: writer}
+  - {id: editor, name: Editor, type: agent, agent_id: editor}
+  - {id: END, name: End, type: end}
+edges:
+  - {id: e1, source: START, target: writer, type: normal}
+  - {id: e2, source: writer, target: editor, type: normal}
+  - {id: e3, source: editor, target: END, type: normal}
+metadata: {collect_steps: false}
+"""
+
+
+class _AdkObject:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _AdkSession:
+    async def create_session(self, **kwargs):
+        return None
+
+
+class _AdkRunner:
+    """Replays one final response per sub-agent, then an event no caller should need."""
+
+    def __init__(self, agent, app_name, session_service):
+        self.agent = agent
+        self.consumed = []
+
+    async def run_async(self, **kwargs):
+        for author in [sub_agent.name for sub_agent in self.agent.sub_agents] + ["after"]:
+            self.consumed.append(author)
+            yield _AdkObject(
+                author=author,
+                content=_AdkObject(parts=[_AdkObject(text=f"{author} text")]),
+                is_final_response=lambda: True,
+            )
+
+
+@pytest.mark.asyncio
+async def test_adk_flow_without_steps_returns_last_agent_response(tmp_path, monkeypatch):
+    """Test a flow without step collection waits for the last sub-agent instead of stopping at the first."""
+    monkeypatch.setattr(settings, "graphs_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "agents_dir", str(tmp_path))
+    (tmp_path / "adk-flow.yaml").write_text(ADK_FLOW_YAML)
+    for name in ("writer", "editor"):
+        (tmp_path / f"{name}.yaml").write_text(
+            f"name: {name}\ndescription: {name}\nsystem_prompt: Be brief.\nframework: google_adk\n"
+            "llm_config: {provider: openai, model: gemini-2.0-flash}\n"
+        )
+    runners = []
+
+    def make_runner(**kwargs):
+        runners.append(_AdkRunner(**kwargs))
+        return runners[-1]
+
+    fake_adk = _AdkObject(
+        LlmAgent=_AdkObject,
+        SequentialAgent=_AdkObject,
+        InMemorySessionService=_AdkSession,
+        Runner=make_runner,
+        types=_AdkObject(Content=_AdkObject, Part=_AdkObject),
+    )
+    monkeypatch.setattr(graph_service, "load_adk", lambda: fake_adk)
+    monkeypatch.setattr(graph_service, "set_google_api_key", lambda api_key: None)
+
+    result = await GraphService.execute_graph("adk-flow", {"message": "hi"}, {})
+    assert result.success, result.error
+    assert result.output == {"response": "editor text"}
+    assert result.steps == []
+    assert runners[0].consumed == ["writer", "editor"]
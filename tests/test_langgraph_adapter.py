@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from app.config import settings
+from app.models import AgentConfig, LLMConfig, ToolExecutionResponse
+from app.services.agent_frameworks.langgraph_adapter import LangGraphAdapter, _build_nodes, clear_app_cache
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_service import LLMService
+from app.services.tool_service import ToolService
+from app.services.yaml_service import YAMLService
+
+
+class ToolCallingFakeModel(GenericFakeChatModel):
+    """Fake agent model that accepts tools and streams its tool calls as a final chunk."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        chunks = [AIMessageChunk(content=message.content)]
+        if message.tool_calls:
+            chunks.append(
+                AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                        for i, call in enumerate(message.tool_calls)
+                    ],
+                )
+            )
+        for chunk in chunks:
+            if run_manager and chunk.content:
+                run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+def _agent(tools=()):
+    return AgentConfig(
+        name="streamer",
+        description="Stream",
+        system_prompt="Be brief.",
+        llm_config=LLMConfig(provider="openai", model="gpt-4o-mini", temperature=0.0),
+        tools=list(tools),
+    )
+
+
+async def _stream(agent_config):
+    return [event async for event in LangGraphAdapter().execute_stream(agent_config, "hi", {})]
+
+
+@pytest.fixture(autouse=True)
+def fresh_nodes():
+    clear_app_cache()
+    yield
+    clear_app_cache()
+
+
+@pytest.mark.asyncio
+async def test_stream_skips_tokens_from_llm_calls_inside_tools(write_tool, monkeypatch):
+    """Test only the agent model's tokens reach the stream, not a model a tool calls."""
+    write_tool("lookup", "Look up", "result = 1")
+    agent_model = ToolCallingFakeModel(
+        messages=iter(
+            [
+                AIMessage(content="checking. ", tool_calls=[{"name": "lookup", "args": {}, "id": "call-1"}]),
+                AIMessage(content="final answer"),
+            ]
+        )
+    )
+    tool_model = GenericFakeChatModel(messages=iter([AIMessage(content="secret tool output")]))
+    monkeypatch.setattr(LLMService, "get_llm", staticmethod(lambda llm_config=None: agent_model))
+
+    async def fake_execute_tool_calls(tool_calls, strategy="parallel", llm_override=None, llm_config=None):
+        text = (await asyncio.to_thread(tool_model.invoke, "summarize")).content
+        return [ToolExecutionResponse(tool_name="lookup", success=True, result=text, execution_time=0.0)]
+
+    monkeypatch.setattr(ToolService, "execute_tool_calls", staticmethod(fake_execute_tool_calls))
+
+    events = await _stream(_agent(["lookup"]))
+    tokens = "".join(event["content"] for event in events if event["type"] == "token")
+    assert tokens == "checking. final answer"
+    assert events[-1] == {"type": "result", "output": "final answer"}
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_cached_response_as_token(monkeypatch):
+    """Test an LLM cache hit still streams the response content."""
+    monkeypatch.setattr(settings, "llm_cache_enabled", True)
+    get_llm_cache.cache_clear()
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="cached reply")]))
+    monkeypatch.setattr(LLMService, "get_llm", staticmethod(lambda llm_config=None: model))
+    try:
+        first = await _stream(_agent())
+        # The model has no second reply, so this run can only be served from the cache.
+        second = await _stream(_agent())
+    finally:
+        get_llm_cache.cache_clear()
+
+    for events in (first, second):
+        assert "".join(event["content"] for event in events if event["type"] == "token") == "cached reply"
+        assert events[-1] == {"type": "result", "output": "cached reply"}
+
+
+@pytest.mark.asyncio
+async def test_nodes_are_reused_for_the_loaded_agent(tools_dir, write_tool, monkeypatch):
+    """Test repeated runs of a YAML agent reuse its built nodes and the tool schema of the loaded config."""
+    monkeypatch.setattr(settings, "agents_dir", str(tools_dir))
+    write_tool("lookup", "Look up", "result = 1")
+    (tools_dir / "reuser.yaml").write_text(
+        "name: reuser\ndescription: Reuse\nsystem_prompt: Be brief.\ntools: [lookup]\n"
+        "llm_config: {provider: openai, model: gpt-4o-mini}\n"
+    )
+    model = ToolCallingFakeModel(messages=iter([AIMessage(content="one"), AIMessage(content="two")]))
+    monkeypatch.setattr(LLMService, "get_llm", staticmethod(lambda llm_config=None: model))
+    built = []
+    monkeypatch.setattr(ToolService, "build_tool_schema", staticmethod(lambda tool_config: built.append(1) or {}))
+
+    adapter = LangGraphAdapter()
+    for expected in ("one", "two"):
+        output, _ = await adapter.execute(YAMLService.load_agent("reuser"), "hi", {})
+        assert output == expected
+    assert _build_nodes.cache_info().hits == 1
+    ToolService.get_tool_schema(YAMLService.load_tool("lookup"))
+    assert len(built) == 1
+
+
+def test_nodes_are_rebuilt_on_a_new_event_loop(monkeypatch):
+    """Test runs on separate event loops do not share an LLM client bound to the first loop."""
+    loops = []
+
+    def get_llm(llm_config=None):
+        loops.append(asyncio.get_running_loop())
+        return GenericFakeChatModel(messages=iter([AIMessage(content="hi")]))
+
+    monkeypatch.setattr(LLMService, "get_llm", staticmethod(get_llm))
+    agent_config = _agent()
+    for _ in range(2):
+        output, _ = asyncio.run(LangGraphAdapter().execute(agent_config, "hi", {}))
+        assert output == "hi"
+    assert len(loops) == 2 and loops[0] is not loops[1]
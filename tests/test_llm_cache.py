@@ -0,0 +1,36 @@
+import pytest
+
+from app.services.llm_cache import LLMCache, LRUBackend
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def test_cache_key_only_for_deterministic_calls():
+    """Test sampled requests are never cached."""
+    assert LLMCache.cache_key("gpt-4", MESSAGES, temperature=0.7) is None
+    assert LLMCache.cache_key("gpt-4", MESSAGES, temperature=None) is None
+    assert LLMCache.cache_key("gpt-4", MESSAGES, temperature=0) == LLMCache.cache_key(
+        "gpt-4", MESSAGES, temperature=0.0
+    )
+    assert LLMCache.cache_key("gpt-4", MESSAGES, temperature=0) != LLMCache.cache_key(
+        "gpt-4", MESSAGES, temperature=0, max_tokens=10
+    )
+
+
+def test_cache_key_ignores_tool_order():
+    """Test tool schemas are hashed independently of their order."""
+    tools = [{"function": {"name": "a"}}, {"function": {"name": "b"}}]
+    assert LLMCache.cache_key("gpt-4", MESSAGES, tools, 0) == LLMCache.cache_key(
+        "gpt-4", MESSAGES, list(reversed(tools)), 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_lru_backend_evicts_and_counts():
+    """Test LRU eviction and hit/miss stats."""
+    cache = LLMCache(LRUBackend(maxsize=1))
+    await cache.set("a", {"content": "1"})
+    assert await cache.get("a") == {"content": "1"}
+    await cache.set("b", {"content": "2"})
+    assert await cache.get("a") is None
+    assert cache.stats == {"hits": 1, "misses": 1}
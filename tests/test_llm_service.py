@@ -0,0 +1,58 @@
+import asyncio
+import inspect
+
+import pytest
+
+from app.config import settings
+from app.models import LLMConfig
+from app.services.llm_service import _HTTP_CLIENTS, LLMService, _build_llm, _get_http_clients, clear_llm_cache
+
+
+def test_get_llm_reuses_client_per_config(monkeypatch):
+    """Test equal configs share one client while differing configs do not."""
+    monkeypatch.setattr(settings, "llm_api_key", "test-key")
+    clear_llm_cache()
+    config = LLMConfig(provider="openai", model="gpt-4o-mini", temperature=0.0)
+
+    llm = LLMService.get_llm(config)
+    assert LLMService.get_llm(config.model_copy()) is llm
+    other = LLMService.get_llm(config.model_copy(update={"temperature": 0.5}))
+    assert other is not llm
+    assert other.http_client is llm.http_client
+    clear_llm_cache()
+
+
+@pytest.mark.asyncio
+async def test_pooled_clients_strip_sdk_headers():
+    """Test both pooled clients drop x-stainless-* headers except the raw-response flag."""
+    http_client, http_async_client = _get_http_clients(None)
+    headers = {"X-Stainless-Lang": "python", "X-Stainless-Raw-Response": "true", "Authorization": "Bearer k"}
+    for client in (http_client, http_async_client):
+        request = client.build_request("POST", "https://llm.invalid/v1/chat/completions", headers=headers)
+        for hook in client.event_hooks["request"]:
+            result = hook(request)
+            if inspect.isawaitable(result):
+                await result
+        assert "x-stainless-lang" not in request.headers
+        assert request.headers["x-stainless-raw-response"] == "true"
+        assert request.headers["authorization"] == "Bearer k"
+    clear_llm_cache()
+
+
+def test_clients_of_closed_loops_are_dropped(monkeypatch):
+    """Test a new event loop releases the pools and LLM clients cached for loops that have closed."""
+    monkeypatch.setattr(settings, "llm_api_key", "test-key")
+    clear_llm_cache()
+    config = LLMConfig(provider="openai", model="gpt-4o-mini")
+
+    async def get_llm():
+        return LLMService.get_llm(config), asyncio.get_running_loop()
+
+    try:
+        first, first_loop = asyncio.run(get_llm())
+        second, second_loop = asyncio.run(get_llm())
+        assert second is not first
+        assert list(_HTTP_CLIENTS) == [second_loop]
+        assert _build_llm.cache_info().currsize == 1
+    finally:
+        clear_llm_cache()
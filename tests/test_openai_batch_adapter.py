@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from app.config import settings
+from app.models import AgentConfig, LLMConfig
+from app.services.agent_frameworks import openai_batch_adapter
+from app.services.agent_frameworks.openai_batch_adapter import OpenAIBatchAdapter
+from app.services.agent_service import AgentService
+
+
+def _ok(custom_id, content):
+    body = {"choices": [{"message": {"content": content}}]}
+    return {"custom_id": custom_id, "response": {"status_code": 200, "body": body}}
+
+
+class FakeBatchClient:
+    """Stands in for AsyncOpenAI: a batch that goes through ``statuses`` and then returns ``files``."""
+
+    def __init__(self, statuses, files=None):
+        self.statuses = list(statuses)
+        self.file_contents = files or {}
+        self.uploaded = b""
+        self.cancelled = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._batch, retrieve=self._batch, cancel=self._cancel)
+
+    async def _create_file(self, file, purpose):
+        self.uploaded = file[1]
+        return SimpleNamespace(id="file-in")
+
+    async def _batch(self, *args, **kwargs):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return SimpleNamespace(
+            id="batch-1",
+            status=status,
+            output_file_id="file-out" if "file-out" in self.file_contents else None,
+            error_file_id="file-err" if "file-err" in self.file_contents else None,
+        )
+
+    async def _cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+
+    async def _content(self, file_id):
+        return SimpleNamespace(text="\n".join(orjson.dumps(record).decode() for record in self.file_contents[file_id]))
+
+
+@pytest.fixture
+def agent_config():
+    return AgentConfig(
+        name="summarizer",
+        description="Summarize",
+        system_prompt="Be brief.",
+        llm_config=LLMConfig(provider="openai", model="gpt-4o-mini", api_key="test-key"),
+        framework="openai_batch",
+    )
+
+
+def _use_client(monkeypatch, client):
+    monkeypatch.setattr(openai_batch_adapter, "get_async_client", lambda api_key, base_url, loop: client)
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_maps_results_by_custom_id(monkeypatch, agent_config):
+    """Test outputs, error-file records and missing records land on their own inputs."""
+    client = FakeBatchClient(
+        ["in_progress", "completed"],
+        {
+            "file-out": [_ok("2", "third"), _ok("0", "first")],
+            "file-err": [{"custom_id": "1", "error": {"message": "rate limited"}}],
+        },
+    )
+    _use_client(monkeypatch, client)
+
+    results = await OpenAIBatchAdapter().execute_batch(agent_config, ["a", "b", "c", "d"], poll_interval=0)
+    assert [output for output, _, _ in results] == ["first", "", "third", ""]
+    assert "rate limited" in results[1][2]
+    assert results[3][2] == "No result returned by batch"
+    assert results[0][2] is None and results[0][1][0]["content"] == "first"
+    assert len(client.uploaded.splitlines()) == 4
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_raises_for_failed_batch(monkeypatch, agent_config):
+    """Test a batch ending in a non-completed status is reported as an error."""
+    _use_client(monkeypatch, FakeBatchClient(["failed"]))
+    with pytest.raises(RuntimeError, match="failed"):
+        await OpenAIBatchAdapter().execute_batch(agent_config, ["a"], poll_interval=0)
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_cancels_after_max_wait(monkeypatch, agent_config):
+    """Test a batch still running at the deadline is cancelled instead of polled indefinitely."""
+    client = FakeBatchClient(["in_progress"])
+    _use_client(monkeypatch, client)
+    with pytest.raises(TimeoutError):
+        await OpenAIBatchAdapter().execute_batch(agent_config, ["a"], poll_interval=0.01, max_wait=0.05)
+    assert client.cancelled == ["batch-1"]
+
+
+@pytest.mark.asyncio
+async def test_agent_service_reports_batch_failure_per_input(tmp_path, monkeypatch):
+    """Test a failed provider batch becomes one error response per input."""
+    monkeypatch.setattr(settings, "agents_dir", str(tmp_path))
+    (tmp_path / "summarizer.yaml").write_text(
+        "name: summarizer\ndescription: Summarize\nsystem_prompt: Be brief.\nframework: openai_batch\n"
+        "llm_config: {provider: openai, model: gpt-4o-mini, api_key: test-key}\n"
+    )
+    _use_client(monkeypatch, FakeBatchClient(["expired"]))
+
+    responses = await AgentService.execute_agent_batch("summarizer", ["a", "b"], use_batch_api=True)
+    assert [response.success for response in responses] == [False, False]
+    assert all("expired" in response.error for response in responses)
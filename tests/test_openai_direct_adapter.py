@@ -0,0 +1,19 @@
+import asyncio
+
+import pytest
+
+from app.services.agent_frameworks.openai_direct_adapter import close_client_cache, get_async_client
+
+
+@pytest.mark.asyncio
+async def test_close_client_cache_closes_pooled_clients():
+    """Test clients are shared per credentials and loop, and closed on shutdown."""
+    loop = asyncio.get_running_loop()
+    client = get_async_client("test-key", None, loop)
+    assert get_async_client("test-key", None, loop) is client
+    assert get_async_client("other-key", None, loop) is not client
+
+    await close_client_cache()
+    assert client.is_closed()
+    assert get_async_client("test-key", None, loop) is not client
+    await close_client_cache()
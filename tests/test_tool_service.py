@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.services.tool_service import ToolService
+
+
+@pytest.fixture
+def tools_dir(tools_dir, write_tool):
+    for name, depends_on in (("fetch", []), ("parse", ["fetch"]), ("report", ["parse"])):
+        write_tool(name, depends_on=depends_on)
+    return tools_dir
+
+
+def test_dependency_levels(tools_dir):
+    """Test calls are grouped so dependencies run in earlier levels."""
+    levels = ToolService._dependency_levels(["report", "fetch", "parse", "fetch"])
+    assert levels == [[1, 3], [2], [0]]
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_keeps_call_order(tools_dir):
+    """Test every strategy returns results in the original call order."""
+    calls = [("report", {}), ("fetch", {}), ("parse", {})]
+    for strategy in ("sequential", "parallel", "dependency"):
+        results = await ToolService.execute_tool_calls(calls, strategy)
+        assert [result.tool_name for result in results] == ["report", "fetch", "parse"]
+        assert all(result.success for result in results)
+
+
+def test_http_client_is_kept_per_event_loop():
+    """Test each event loop gets its own client and shutdown closes the one on the running loop."""
+
+    async def get_client():
+        return ToolService.get_http_client()
+
+    async def get_and_close():
+        client = ToolService.get_http_client()
+        await ToolService.close_http_client()
+        return client
+
+    first = asyncio.run(get_client())
+    try:
+        second = asyncio.run(get_and_close())
+        assert first is not second
+        assert second.is_closed
+        assert ToolService._http_clients == {}
+    finally:
+        # The first client's loop is gone; it never opened a connection, so closing it here is safe.
+        asyncio.run(first.aclose())
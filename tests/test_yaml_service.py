@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from app.services.yaml_service import YAMLService
+
+
+@pytest.fixture
+def tools_dir(tools_dir, write_tool):
+    write_tool("echo", "Echo input", "result = parameters")
+    return tools_dir
+
+
+def test_load_tool_is_cached(tools_dir):
+    """Test repeated loads return the cached config."""
+    first = YAMLService.load_tool("echo")
+    assert first is not None
+    assert YAMLService.load_tool("echo") is first
+
+
+def test_load_tool_cache_invalidated_on_change(tools_dir):
+    """Test edits to the YAML file are picked up."""
+    assert YAMLService.load_tool("echo").description == "Echo input"
+
+    path = tools_dir / "echo.yaml"
+    path.write_text(path.read_text().replace("Echo input", "Echo changed"))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert YAMLService.load_tool("echo").description == "Echo changed"
+
+    assert YAMLService.delete_tool("echo") is True
+    assert YAMLService.load_tool("echo") is None
+
+
+def test_save_tool_round_trip(tools_dir):
+    """Test a saved tool can be loaded back."""
+    tool = YAMLService.load_tool("echo").model_copy(update={"name": "echo_copy"})
+    YAMLService.save_tool(tool)
+    loaded = YAMLService.load_tool("echo_copy")
+    assert loaded is not None
+    assert loaded.type == tool.type
+    assert loaded.python_code == tool.python_code
+
+
+def test_tool_schema_sidecar(tools_dir):
+    """Test the persisted schema is used only while it is newer than the YAML."""
+    from app.services.tool_service import ToolService
+
+    schema = ToolService.get_tool_schema(YAMLService.load_tool("echo"))
+    assert not (tools_dir / "echo.schema.json").exists()
+
+    ToolService.warm_schemas()
+    assert YAMLService.load_tool_schema("echo") == schema
+
+    path = tools_dir / "echo.yaml"
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    assert YAMLService.load_tool_schema("echo") is None
+
+    YAMLService.delete_tool("echo")
+    assert not (tools_dir / "echo.schema.json").exists()
+
+
+def test_load_tools_skips_missing(tools_dir):
+    """Test bulk loading keeps order and drops unknown names."""
+    tools = YAMLService.load_tools(["missing", "echo"])
+    assert [tool.name for tool in tools] == ["echo"]
+    assert tools[0] is YAMLService.load_tool("echo")